@@ -22,12 +22,14 @@ from src.schemas.clause import (
 from src.services.clause_extractor import ClauseExtractor
 from src.services.vector_store import VectorStore
 from src.services.clause_deduplicator import ClauseDeduplicator
+from src.services.document_processor import DocumentProcessor
 
 router = APIRouter()
 logger = get_logger(__name__)
 clause_extractor = ClauseExtractor()
 vector_store = VectorStore()
 clause_deduplicator = ClauseDeduplicator()
+document_processor = DocumentProcessor()
 
 
 @router.post(
@@ -157,8 +159,17 @@ def extract_clauses(
     extracted_clauses = validated_clauses
 
     # Store clauses in database
+    # Locate PDF clauses once here so highlighted exports don't search for them again
+    if document.file_type.value == "pdf":
+        clause_coordinates = document_processor.locate_snippets(
+            document.file_path,
+            [(clause.page_number, clause.extracted_text) for clause in extracted_clauses]
+        )
+    else:
+        clause_coordinates = [None] * len(extracted_clauses)
+    
     db_clauses = []
-    for clause in extracted_clauses:
+    for clause, coordinates in zip(extracted_clauses, clause_coordinates):
         db_clause = Clause(
             document_id=document_id,
             clause_type=clause.clause_type.value,
@@ -170,7 +181,7 @@ def extract_clauses(
             risk_flags=clause.risk_flags,  # Already a list of strings
             risk_reasoning=clause.risk_reasoning,
             clause_subtype=clause.clause_subtype,
-            coordinates=None  # TODO: Extract coordinates from PDF
+            coordinates=coordinates
         )
         db.add(db_clause)
         db_clauses.append(db_clause)
@@ -1,7 +1,8 @@
 """Conversation and Q&A API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID, uuid4
 
 from src.core.database import get_db
@@ -199,7 +200,7 @@ def get_conversation(
     response_model=AskQuestionResponse,
     status_code=200
 )
-def ask_question(
+async def ask_question(
     conversation_id: UUID,
     request: AskQuestionRequest,
     current_user: User = Depends(get_current_user),
@@ -214,6 +215,74 @@ def ask_question(
     3. Stores user question and assistant answer
     4. Returns answer with citations
     """
+    # Sync SQLAlchemy session work runs in the threadpool so it doesn't block
+    # the event loop; only the RAG pipeline is awaited on it
+    conversation, conversation_history, next_index = await run_in_threadpool(
+        _store_question, conversation_id, request.question, current_user, db
+    )
+    
+    # Run RAG pipeline
+    try:
+        result = await rag_pipeline.ask(
+            question=request.question,
+            workspace_id=str(conversation.workspace_id),
+            document_ids=request.document_ids,
+            conversation_history=conversation_history
+        )
+        
+        assistant_message = await run_in_threadpool(
+            _store_answer, conversation, result, next_index + 1, db
+        )
+        
+        # Convert citations to response format
+        citations_response = []
+        for c in result["citations"]:
+            if isinstance(c, dict):
+                citations_response.append(CitationResponse(**c))
+            else:
+                citations_response.append(c)
+        
+        return AskQuestionResponse(
+            answer=result["answer"],
+            citations=citations_response,
+            message_id=assistant_message.id,
+            conversation_id=conversation_id,
+            retrieved_chunks_count=result.get("retrieved_chunks_count", 0)
+        )
+        
+    except Exception as e:
+        logger.error(
+            f"Error processing question in conversation {conversation_id}",
+            extra={
+                "conversation_id": str(conversation_id),
+                "workspace_id": str(conversation.workspace_id),
+                "question": request.question[:100] if request.question else None,
+                "error": str(e)
+            },
+            exc_info=True
+        )
+        
+        await run_in_threadpool(_store_error_message, conversation_id, next_index + 1, db)
+        
+        raise ProcessingError(
+            message=f"Failed to process question: {str(e)}",
+            stage="rag_pipeline",
+            user_message="I encountered an error while processing your question. Please try again in a moment."
+        ) from e
+
+
+def _store_question(
+    conversation_id: UUID,
+    question: str,
+    current_user: User,
+    db: Session
+) -> Tuple[Conversation, List[Dict], int]:
+    """
+    Load the conversation and its history, then store the user question.
+    
+    Returns:
+        (conversation, conversation_history, index of the stored question)
+    """
     # Get conversation
     conversation = db.query(Conversation).filter(
         Conversation.id == conversation_id
@@ -256,7 +325,7 @@ def ask_question(
     user_message = ConversationMessage(
         conversation_id=conversation_id,
         role="user",
-        content=request.question,
+        content=question,
         message_index=next_index,
         citations=None
     )
@@ -264,76 +333,45 @@ def ask_question(
     db.commit()
     db.refresh(user_message)
     
-    # Run RAG pipeline
-    try:
-        result = rag_pipeline.ask(
-            question=request.question,
-            workspace_id=str(conversation.workspace_id),
-            document_ids=request.document_ids,
-            conversation_history=conversation_history
-        )
-        
-        # Store assistant answer
-        assistant_message = ConversationMessage(
-            conversation_id=conversation_id,
-            role="assistant",
-            content=result["answer"],
-            message_index=next_index + 1,
-            citations=[c for c in result["citations"]]  # Store as JSON
-        )
-        db.add(assistant_message)
-        
-        # Update conversation timestamp
-        from datetime import datetime
-        conversation.updated_at = datetime.utcnow()
-        
-        db.commit()
-        db.refresh(assistant_message)
-        
-        # Convert citations to response format
-        citations_response = []
-        for c in result["citations"]:
-            if isinstance(c, dict):
-                citations_response.append(CitationResponse(**c))
-            else:
-                citations_response.append(c)
-        
-        return AskQuestionResponse(
-            answer=result["answer"],
-            citations=citations_response,
-            message_id=assistant_message.id,
-            conversation_id=conversation_id,
-            retrieved_chunks_count=result.get("retrieved_chunks_count", 0)
-        )
-        
-    except Exception as e:
-        logger.error(
-            f"Error processing question in conversation {conversation_id}",
-            extra={
-                "conversation_id": str(conversation_id),
-                "workspace_id": str(conversation.workspace_id),
-                "question": request.question[:100] if request.question else None,
-                "error": str(e)
-            },
-            exc_info=True
-        )
-        
-        # Store error message
-        error_message = ConversationMessage(
-            conversation_id=conversation_id,
-            role="assistant",
-            content="I apologize, but I encountered an error while processing your question. Please try again.",
-            message_index=next_index + 1,
-            citations=None
-        )
-        db.add(error_message)
-        db.commit()
-        
-        raise ProcessingError(
-            message=f"Failed to process question: {str(e)}",
-            stage="rag_pipeline",
-            user_message="I encountered an error while processing your question. Please try again in a moment."
-        ) from e
+    return conversation, conversation_history, next_index
+
+
+def _store_answer(
+    conversation: Conversation,
+    result: Dict,
+    message_index: int,
+    db: Session
+) -> ConversationMessage:
+    """Store the assistant answer and bump the conversation timestamp"""
+    assistant_message = ConversationMessage(
+        conversation_id=conversation.id,
+        role="assistant",
+        content=result["answer"],
+        message_index=message_index,
+        citations=[c for c in result["citations"]]  # Store as JSON
+    )
+    db.add(assistant_message)
+    
+    # Update conversation timestamp
+    from datetime import datetime
+    conversation.updated_at = datetime.utcnow()
+    
+    db.commit()
+    db.refresh(assistant_message)
+    return assistant_message
+
+
+def _store_error_message(conversation_id: UUID, message_index: int, db: Session) -> None:
+    """Store the apology shown when the pipeline fails"""
+    error_message = ConversationMessage(
+        conversation_id=conversation_id,
+        role="assistant",
+        content="I apologize, but I encountered an error while processing your question. Please try again.",
+        message_index=message_index,
+        citations=None
+    )
+    db.add(error_message)
+    db.commit()
 
 
 @router.patch(
@@ -1,7 +1,7 @@
 """Export API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import StreamingResponse, Response
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import List, Optional
 from uuid import UUID
 from io import BytesIO
@@ -93,16 +93,20 @@ def download_evidence_pack(
     
     # Generate evidence pack
     try:
-        pdf_content = evidence_generator.generate_evidence_pack(
+        # Write straight into the buffer we stream, no intermediate bytes copy
+        buffer = BytesIO()
+        evidence_generator.generate_evidence_pack(
             question=user_message.content,
             answer=message.content,
             citations=citations,
             workspace_name=conversation.workspace.name,
             conversation_title=conversation.title,
+            out=buffer,
         )
+        buffer.seek(0)
         
         return StreamingResponse(
-            BytesIO(pdf_content),
+            buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="evidence-pack-{message_id.hex[:8]}.pdf"'
@@ -167,14 +171,17 @@ def download_conversation_evidence_pack(
     
     # Generate evidence pack
     try:
-        pdf_content = evidence_generator.generate_conversation_evidence_pack(
+        buffer = BytesIO()
+        evidence_generator.generate_conversation_evidence_pack(
             conversation_messages=messages_data,
             workspace_name=conversation.workspace.name,
             conversation_title=conversation.title,
+            out=buffer,
         )
+        buffer.seek(0)
         
         return StreamingResponse(
-            BytesIO(pdf_content),
+            buffer,
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="conversation-evidence-pack-{conversation_id.hex[:8]}.pdf"'
@@ -216,8 +223,8 @@ def export_clauses(
     if not document:
         raise HTTPException(status_code=404, detail="Document not found")
     
-    # Get all clauses for the document
-    clauses = db.query(Clause).filter(Clause.document_id == document_id).all()
+    # Get all clauses for the document with document relationship loaded
+    clauses = db.query(Clause).options(selectinload(Clause.document)).filter(Clause.document_id == document_id).all()
     
     if not clauses:
         raise HTTPException(
@@ -227,16 +234,17 @@ def export_clauses(
     
     try:
         if format == "json":
-            content = export_service.export_clauses_json(clauses)
+            content = BytesIO(export_service.export_clauses_json(clauses))
             media_type = "application/json"
             filename = f"clauses-{document.name}-{document_id.hex[:8]}.json"
         else:  # csv
-            content = export_service.export_clauses_csv(clauses)
+            # Stream rows as they are written instead of building the file first
+            content = export_service.iter_clauses_csv(clauses)
             media_type = "text/csv"
             filename = f"clauses-{document.name}-{document_id.hex[:8]}.csv"
         
         return StreamingResponse(
-            BytesIO(content),
+            content,
             media_type=media_type,
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"'
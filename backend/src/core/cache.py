@@ -8,8 +8,9 @@ Provides caching for:
 - Document lists
 """
 import json
+import base64
 import hashlib
-from typing import Optional, Any, Callable
+from typing import Optional, Any, Callable, Dict, List, Union
 from functools import wraps
 import redis
 from redis.exceptions import RedisError
@@ -69,6 +70,69 @@ class CacheService:
             logger.warning(f"Cache set error for key {key}: {e}", extra={"cache_key": key}, exc_info=True)
             return False
     
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several values in one round-trip (None for misses)"""
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+        
+        try:
+            values = self.client.mget(keys)
+        except RedisError as e:
+            logger.warning(f"Cache mget error for {len(keys)} keys: {e}", exc_info=True)
+            return [None] * len(keys)
+        
+        results = []
+        for key, value in zip(keys, values):
+            try:
+                results.append(json.loads(value) if value else None)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Cache get error for key {key}: {e}", extra={"cache_key": key}, exc_info=True)
+                results.append(None)
+        return results
+    
+    def mset(self, items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Set several values with the same TTL in one pipelined round-trip"""
+        if not self.enabled or not items:
+            return False
+        
+        try:
+            ttl = ttl or settings.cache_default_ttl
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, json.dumps(value, default=str))
+            pipe.execute()
+            return True
+        except (RedisError, TypeError) as e:
+            logger.warning(f"Cache mset error for {len(items)} keys: {e}", exc_info=True)
+            return False
+    
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get binary value from cache (stored base64-encoded)"""
+        if not self.enabled:
+            return None
+        
+        try:
+            value = self.client.get(key)
+            if value:
+                return base64.b64decode(value)
+        except (RedisError, ValueError) as e:
+            logger.warning(f"Cache get error for key {key}: {e}", extra={"cache_key": key}, exc_info=True)
+        
+        return None
+    
+    def set_bytes(self, key: str, value: Union[bytes, memoryview], ttl: Optional[int] = None) -> bool:
+        """Set binary value (bytes or a buffer view) in cache with optional TTL"""
+        if not self.enabled:
+            return False
+        
+        try:
+            ttl = ttl or settings.cache_default_ttl
+            self.client.setex(key, ttl, base64.b64encode(value).decode("ascii"))
+            return True
+        except RedisError as e:
+            logger.warning(f"Cache set error for key {key}: {e}", extra={"cache_key": key}, exc_info=True)
+            return False
+    
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
         if not self.enabled:
@@ -181,7 +245,13 @@ def cache_result(key_prefix: str, ttl: Optional[int] = None):
     return decorator
 
 
-def hash_text(text: str) -> str:
-    """Generate hash for text (for embedding cache keys)"""
-    return hashlib.sha256(text.encode()).hexdigest()[:16]
+def hash_text(text: Union[str, bytes]) -> str:
+    """
+    Generate hash for text (for embedding cache keys).
+    
+    Accepts already UTF-8 encoded bytes so callers that need the bytes anyway
+    don't encode twice.
+    """
+    data = text if isinstance(text, bytes) else text.encode()
+    return hashlib.sha256(data).hexdigest()[:16]
 
@@ -11,11 +11,21 @@ class Settings(BaseSettings):
     
     # OpenAI
     openai_api_key: Optional[str] = None
+    llm_max_concurrency: int = 10  # Concurrent document structuring calls
+    llm_tokens_per_minute: int = 200000  # TPM budget for concurrent structuring calls
+    use_llm_structuring: bool = True  # False: structure well-marked contracts with regex, skipping the LLM
+    structure_min_markers_per_page: float = 3.0  # Clause markers + headers per page to count as well-structured
+    embedding_sub_batch_size: int = 96  # Inputs per embeddings request
+    embedding_max_concurrency: int = 4  # Concurrent embeddings requests per batch
+    embedding_coalesce_window_ms: int = 10  # aget_embedding calls within this window share one request
+    embedding_coalesce_max_items: int = 128  # Flush a coalesced batch early at this size
     
     # File Upload
     upload_dir: str = "./uploads"
     max_file_size_mb: int = 50
     max_pages_per_document: int = 100
+    pdf_parallel_min_pages: int = 10  # Extract pages in worker processes from this page count up
+    pdf_extraction_workers: int = 4
     allowed_file_types: list[str] = ["pdf", "docx"]
     
     # ChromaDB
@@ -40,6 +50,7 @@ class Settings(BaseSettings):
     cache_workspace_stats_ttl: int = 60  # 1 minute for workspace stats
     cache_vector_search_ttl: int = 3600  # 1 hour for vector search results
     cache_embedding_ttl: int = 604800  # 7 days for embeddings
+    cache_evidence_pack_ttl: int = 3600  # 1 hour for generated evidence pack PDFs
     
     class Config:
         env_file = ".env"
@@ -124,7 +124,7 @@ class ProcessingError(ContractIQException):
 class RateLimitError(ContractIQException):
     """Rate limit exceeded"""
     
-    def __init__(self, message: str = "Rate limit exceeded", retry_after: Optional[int] = None):
+    def __init__(self, message: str = "Rate limit exceeded", retry_after: Optional[float] = None):
         details = {"retry_after": retry_after} if retry_after else {}
         super().__init__(
             message=message,
@@ -133,4 +133,5 @@ class RateLimitError(ContractIQException):
             details=details,
             user_message="Too many requests. Please wait a moment before trying again."
         )
+        self.retry_after = retry_after
 
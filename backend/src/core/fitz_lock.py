@@ -0,0 +1,9 @@
+"""Process-wide lock for in-process PyMuPDF calls"""
+import threading
+
+# PyMuPDF is not thread-safe, even across separate Documents: every in-process
+# fitz call (open, extract, search, annotate, save, close) runs under this lock.
+# Hold it per page or per call rather than for a whole document, so one large
+# PDF doesn't stall every other request that touches PyMuPDF. Worker processes
+# have their own MuPDF state and don't need it.
+FITZ_LOCK = threading.RLock()
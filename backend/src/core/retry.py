@@ -3,8 +3,11 @@ Retry logic for external API calls and operations.
 
 Provides exponential backoff and configurable retry strategies.
 """
+import math
 import time
 import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Callable, TypeVar, Optional, List, Type
 from functools import wraps
 import logging
@@ -47,6 +50,68 @@ class RetryConfig:
         self.retryable_exceptions = retryable_exceptions or [Exception]
 
 
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+    
+    Args:
+        value: Delay in seconds or an HTTP-date
+    
+    Returns:
+        Seconds to wait (never negative), or None if missing, unparseable or
+        not finite ("inf", "nan")
+    """
+    if not value:
+        return None
+    
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(0.0, seconds) if math.isfinite(seconds) else None
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def _retry_delay(error: Exception, attempt: int, config: RetryConfig) -> Optional[float]:
+    """
+    Delay before the next attempt: the error's retry_after hint if it has one,
+    else exponential backoff.
+    
+    Returns:
+        Seconds to sleep (at most config.max_delay), or None if the server asked
+        for a longer wait than max_delay; the caller should fail fast then
+        instead of retrying before the hint expires.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        retry_after = float(retry_after)
+        if not math.isfinite(retry_after) or retry_after > config.max_delay:
+            return None
+        return max(retry_after, 0.0)
+    
+    # Calculate delay with exponential backoff
+    delay = min(
+        config.initial_delay * (config.exponential_base ** attempt),
+        config.max_delay
+    )
+    
+    # Add jitter if enabled
+    if config.jitter:
+        jitter_amount = delay * 0.1  # 10% jitter
+        delay += random.uniform(-jitter_amount, jitter_amount)
+        delay = max(0, delay)  # Ensure non-negative
+    
+    return delay
+
+
 def retry_with_backoff(
     func: Callable[..., T],
     config: Optional[RetryConfig] = None,
@@ -95,17 +160,13 @@ def retry_with_backoff(
                         retryable=False
                     ) from e
                 
-                # Calculate delay with exponential backoff
-                delay = min(
-                    config.initial_delay * (config.exponential_base ** attempt),
-                    config.max_delay
-                )
-                
-                # Add jitter if enabled
-                if config.jitter:
-                    jitter_amount = delay * 0.1  # 10% jitter
-                    delay += random.uniform(-jitter_amount, jitter_amount)
-                    delay = max(0, delay)  # Ensure non-negative
+                delay = _retry_delay(e, attempt, config)
+                if delay is None:
+                    logger.error(
+                        f"{op_name}: Server asked to wait longer than {config.max_delay}s, "
+                        f"not retrying. Error: {type(e).__name__}: {e}"
+                    )
+                    raise
                 
                 logger.warning(
                     f"{op_name}: Attempt {attempt + 1}/{config.max_retries + 1} failed. "
@@ -171,17 +232,13 @@ def retry_async_with_backoff(
                         retryable=False
                     ) from e
                 
-                # Calculate delay with exponential backoff
-                delay = min(
-                    config.initial_delay * (config.exponential_base ** attempt),
-                    config.max_delay
-                )
-                
-                # Add jitter if enabled
-                if config.jitter:
-                    jitter_amount = delay * 0.1  # 10% jitter
-                    delay += random.uniform(-jitter_amount, jitter_amount)
-                    delay = max(0, delay)
+                delay = _retry_delay(e, attempt, config)
+                if delay is None:
+                    logger.error(
+                        f"{op_name}: Server asked to wait longer than {config.max_delay}s, "
+                        f"not retrying. Error: {type(e).__name__}: {e}"
+                    )
+                    raise
                 
                 logger.warning(
                     f"{op_name}: Attempt {attempt + 1}/{config.max_retries + 1} failed. "
@@ -9,20 +9,63 @@ This service:
    - Metadata extraction
 3. Returns structured data ready for clause extraction and RAG
 """
+import asyncio
+import bisect
+import functools
+import io
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import fitz  # PyMuPDF
 from docx import Document as DocxDocument
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 import re
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 from instructor import patch
 from pydantic import BaseModel, Field
 
 from src.core.config import settings
+from src.core.fitz_lock import FITZ_LOCK
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Kept byte-identical across calls (variable data goes in the user message) so
+# OpenAI's automatic prompt caching can reuse the prefix
+_SYSTEM_PROMPT = """You are a document analysis expert. Analyze this contract document and extract:
+
+1. **Sections**: Identify all major sections (e.g., TERMINATION, LIABILITY, PAYMENT TERMS, etc.) with their page numbers and character positions in the text.
+
+2. **Semantic Chunks**: Break the text into semantic chunks. Each chunk should be a COMPLETE semantic unit:
+   - A complete clause (not split mid-sentence)
+   - A complete definition
+   - A complete paragraph with full meaning
+   - Do NOT create arbitrary fixed-size chunks
+   - Preserve context - each chunk should make sense on its own
+   - **CRITICAL**: You MUST create chunks for ALL pages, even if content appears similar or duplicate
+   - **CRITICAL**: Do NOT skip any pages - every page must have at least one chunk
+
+3. **Metadata**: Extract document metadata:
+   - Document type (e.g., "SaaS Agreement", "Vendor Contract")
+   - Parties involved (if mentioned)
+   - Key dates
+   - Any other relevant metadata
+
+4. **Contract Type Hints**: Identify what type of contract this appears to be:
+   - vendor_procurement
+   - service_agreement
+   - saas_technology
+   - government_contract
+   - employment
+   - generic
+
+Be precise with page numbers and character positions. Each chunk should reference the correct page number based on where that text appears in the document. Ensure you process every single page of the document."""
+
 
 class DocumentSection(BaseModel):
     """Document section identified by LLM"""
@@ -73,6 +116,159 @@ class DocumentStructure(BaseModel):
     )
 
 
+class _TokenRateLimiter:
+    """
+    Rolling 60-second token budget for concurrent LLM calls.
+
+    Callers await acquire() with an estimate of the tokens they are about to
+    send; the call sleeps until the window has room for it.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.tokens_per_minute = tokens_per_minute
+        self._window: deque = deque()  # (timestamp, tokens)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._window and now - self._window[0][0] >= 60:
+                    self._window.popleft()
+
+                used = sum(count for _, count in self._window)
+                # Always admit a request into an empty window, even if it alone exceeds the budget
+                if not self._window or used + tokens <= self.tokens_per_minute:
+                    self._window.append((now, tokens))
+                    return
+
+                await asyncio.sleep(60 - (now - self._window[0][0]))
+
+
+# Plain text only: no image blocks, ligatures expanded to their letters, and
+# nothing outside the mediabox. TEXT_INHIBIT_SPACES is deliberately left out,
+# it glues words together where the PDF positions them with gaps.
+_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+def _extract_page_data(page: fitz.Page, page_number: int) -> Dict:
+    """
+    Extract text and text-block coordinates from a single PDF page.
+    
+    Args:
+        page: PyMuPDF page
+        page_number: Page number (1-indexed)
+        
+    Returns:
+        Dict with page_number, text and blocks
+    """
+    text = page.get_text("text", flags=_TEXT_FLAGS, sort=True)
+    
+    # Get text blocks with coordinates for highlighting.
+    # "blocks" yields (x0, y0, x1, y1, text, block_no, block_type) with the
+    # text already joined in C, avoiding the per-span dicts of "dict" mode
+    text_blocks = []
+    for x0, y0, x1, y1, block_text, _block_no, block_type in page.get_text("blocks", flags=_TEXT_FLAGS, sort=True):
+        if block_type == 0 and block_text.strip():  # Text block
+            text_blocks.append({
+                "text": block_text,
+                "bbox": [x0, y0, x1, y1],
+                "page": page_number
+            })
+    
+    return {
+        "page_number": page_number,
+        "text": text,
+        "blocks": text_blocks
+    }
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[Dict]:
+    """
+    Extract pages [start, stop) of a PDF; runs in a worker process.
+    
+    Each worker opens its own document, since PyMuPDF objects cannot be
+    shared across processes (or used from several threads).
+    """
+    doc = fitz.open(file_path)
+    try:
+        return [_extract_page_data(doc[page_num], page_num + 1) for page_num in range(start, stop)]
+    finally:
+        doc.close()
+
+
+_extraction_pool: Optional[ProcessPoolExecutor] = None
+_extraction_pool_lock = threading.Lock()
+
+
+def _get_extraction_pool() -> ProcessPoolExecutor:
+    """
+    Shared process pool for page extraction, created on first use.
+    
+    Uses the spawn start method: forking a multi-threaded server (request
+    threadpool, open MuPDF state) can deadlock the child.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=settings.pdf_extraction_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _extraction_pool
+
+
+# Clause markers ("B. ", "1. " at the start of the text or a line) and sentence ends.
+# Sentence ends never consume a newline so a marker on the next line still matches.
+_FALLBACK_BOUNDARY_RE = re.compile(
+    r'(?P<marker>(?:^|\n)\s*(?:[A-Z]|\d+)\.\s+)'
+    r'|(?P<sentend>(?<=[.!?])[ \t]+|(?<=[.!?])(?=\n))'
+)
+
+# Used to decide whether a document is regular enough to structure without the LLM
+_CLAUSE_MARKER_RE = re.compile(r'^\s*(?:[A-Z]|\d+(?:\.\d+)*)\.\s+', re.MULTILINE)
+_SECTION_HEADER_RE = re.compile(r'^[A-Z][A-Z ]{4,}$', re.MULTILINE)
+
+# Keyword classifier for contract type when the LLM is skipped
+_CONTRACT_TYPE_KEYWORDS = {
+    "vendor_procurement": ("vendor", "supplier", "procurement", "purchase order", "delivery"),
+    "service_agreement": ("services", "service provider", "statement of work", "deliverables"),
+    "saas_technology": ("software", "saas", "subscription", "uptime", "service level"),
+    "government_contract": ("government", "federal", "agency", "contracting officer"),
+    "employment": ("employee", "employer", "employment", "salary", "compensation"),
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def _search_page_cached(
+    file_path: str,
+    mtime: float,
+    page_number: int,
+    snippet: str
+) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Find the first bbox of snippet on a PDF page, memoized per file version.
+    
+    mtime is part of the cache key so a replaced file is searched again.
+    
+    Returns:
+        (x0, y0, x1, y1) of the first match, or None if not found
+    """
+    with FITZ_LOCK:
+        doc = fitz.open(file_path)
+        try:
+            if page_number > len(doc):
+                return None
+            
+            text_instances = doc[page_number - 1].search_for(snippet)
+            if not text_instances:
+                return None
+            
+            bbox = text_instances[0]
+            return (bbox.x0, bbox.y0, bbox.x1, bbox.y1)
+        finally:
+            doc.close()
+
+
 class DocumentProcessor:
     """
     Document processing service using PyMuPDF + LLM for intelligent structuring.
@@ -89,6 +285,7 @@ class DocumentProcessor:
             raise ValueError("OpenAI API key not configured. Set OPENAI_API_KEY in environment.")
         
         self.client = patch(OpenAI(api_key=settings.openai_api_key))
+        self.async_client = patch(AsyncOpenAI(api_key=settings.openai_api_key))
         self.detected_contract_type: Optional[str] = None
     
     def process_pdf(self, file_path: str) -> Dict:
@@ -108,95 +305,172 @@ class DocumentProcessor:
                 - metadata: Document metadata
                 - contract_type_hints: Contract type hints
         """
-        doc = fitz.open(file_path)
-        
-        # Extract text and coordinates from each page
-        pages_data = []
-        full_text_parts = []
-        page_text_map = {}  # Map page number to text for context
+        extracted = self._extract_pdf(file_path)
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            
-            # Get text blocks with coordinates for highlighting
-            blocks = page.get_text("dict")
-            text_blocks = []
-            for block in blocks.get("blocks", []):
-                if "lines" in block:  # Text block
-                    block_text = " ".join(
-                        " ".join(span.get("text", "") for span in line.get("spans", []))
-                        for line in block.get("lines", [])
-                    )
-                    if block_text.strip():
-                        bbox = block.get("bbox", [0, 0, 0, 0])
-                        text_blocks.append({
-                            "text": block_text,
-                            "bbox": bbox,
-                            "page": page_num + 1
-                        })
+        try:
+            # Use LLM to structure the document intelligently
+            structure = self._structure_with_llm(
+                extracted["full_text"], extracted["page_text_map"], extracted["page_offsets"]
+            )
             
-            pages_data.append({
-                "page_number": page_num + 1,
-                "text": text,
-                "blocks": text_blocks
-            })
+            # Reuse the open document for coordinate lookup instead of parsing it again
+            return self._build_result(extracted, structure, pdf_doc=extracted["doc"])
+        finally:
+            with FITZ_LOCK:
+                extracted["doc"].close()
+    
+    def process_docx(self, file_path: str) -> Dict:
+        """
+        Process DOCX document.
+        
+        Args:
+            file_path: Path to DOCX file
             
-            full_text_parts.append(text)
-            page_text_map[page_num + 1] = text
+        Returns:
+            Same structure as process_pdf
+        """
+        extracted = self._extract_docx(file_path)
         
-        full_text = "\n\n".join(full_text_parts)
-        page_count = len(doc)
-        doc.close()
+        # Use LLM to structure the document
+        structure = self._structure_with_llm(
+            extracted["full_text"], extracted["page_text_map"], extracted["page_offsets"]
+        )
         
-        # Use LLM to structure the document intelligently
-        structure = self._structure_with_llm(full_text, page_text_map)
+        return self._build_result(extracted, structure)
+    
+    async def process_many_async(self, file_paths: List[str]) -> List[Dict]:
+        """
+        Process several PDF/DOCX documents concurrently.
         
-        # Post-processing validation: Ensure all pages are covered
-        pages_with_chunks = set(chunk.page_number for chunk in structure.chunks)
-        all_pages = set(page_text_map.keys())
-        missing_pages = all_pages - pages_with_chunks
+        Text extraction runs in worker threads (at most
+        settings.pdf_extraction_workers at a time, with PyMuPDF calls
+        serialized by FITZ_LOCK), then the LLM structuring calls are issued
+        concurrently (bounded by settings.llm_max_concurrency and a rolling
+        tokens-per-minute budget) instead of one after another.
         
-        # If pages are missing, add fallback chunks for those pages
-        if missing_pages:
-            logger.warning(
-                f"LLM did not process pages {sorted(missing_pages)}. Adding fallback chunks.",
-                extra={"missing_pages": sorted(missing_pages)}
-            )
-            for page_num in sorted(missing_pages):
-                page_text = page_text_map[page_num]
-                if page_text.strip():
-                    fallback_chunks = self._create_fallback_chunks_for_page(
-                        page_num, page_text, structure.chunks
+        Args:
+            file_paths: Paths to PDF or DOCX files
+            
+        Returns:
+            List of results (same structure as process_pdf), in input order
+        """
+        semaphore = asyncio.Semaphore(settings.llm_max_concurrency)
+        extract_semaphore = asyncio.Semaphore(settings.pdf_extraction_workers)
+        rate_limiter = _TokenRateLimiter(settings.llm_tokens_per_minute)
+        
+        async def _process_one(file_path: str) -> Dict:
+            is_pdf = Path(file_path).suffix.lower() == ".pdf"
+            extract = self._extract_pdf if is_pdf else self._extract_docx
+            async with extract_semaphore:
+                extracted = await asyncio.to_thread(extract, file_path)
+            pdf_doc = extracted.get("doc")
+            
+            try:
+                async with semaphore:
+                    structure = await self._structure_with_llm_async(
+                        extracted["full_text"],
+                        extracted["page_text_map"],
+                        extracted["page_offsets"],
+                        rate_limiter
                     )
-                    structure.chunks.extend(fallback_chunks)
+                
+                return await asyncio.to_thread(self._build_result, extracted, structure, pdf_doc)
+            finally:
+                if pdf_doc is not None:
+                    with FITZ_LOCK:
+                        pdf_doc.close()
         
-        # Extract coordinates for chunks
-        structure.chunks = self._extract_chunk_coordinates(file_path, structure.chunks, pages_data)
+        return await asyncio.gather(*(_process_one(path) for path in file_paths))
+    
+    def _extract_pdf(self, file_path: str) -> Dict:
+        """
+        Extract text and coordinates from each page of a PDF.
         
-        # Update detected contract type
-        if structure.contract_type_hints:
-            self.detected_contract_type = structure.contract_type_hints[0]
+        Args:
+            file_path: Path to PDF file
+            
+        Returns:
+            Dict with page_count, full_text, pages, page_text_map, page_offsets and
+            the still-open fitz document under "doc" (the caller closes it)
+        """
+        with FITZ_LOCK:
+            doc = fitz.open(file_path)
+            page_count = len(doc)
+        
+        # A single worker is slower than extracting in-process
+        if page_count >= settings.pdf_parallel_min_pages and self._extraction_workers(page_count) >= 2:
+            # Worker processes don't share this process's MuPDF state, so no lock
+            pages_data = self._extract_pages_parallel(file_path, page_count)
+        else:
+            # Lock per page so other PDF work can interleave with a long document
+            pages_data = []
+            for page_num in range(page_count):
+                with FITZ_LOCK:
+                    pages_data.append(_extract_page_data(doc[page_num], page_num + 1))
+        
+        # Extract text and coordinates from each page
+        buf = io.StringIO()
+        page_offsets: Dict[int, Tuple[int, int]] = {}  # Page number -> (start, end) in full_text
+        page_text_map = {}  # Map page number to text for context
+        
+        for page_num, page_data in enumerate(pages_data):
+            text = page_data["text"]
+            if page_num:
+                buf.write("\n\n")
+            start = buf.tell()
+            buf.write(text)
+            page_offsets[page_num + 1] = (start, buf.tell())
+            page_text_map[page_num + 1] = text
         
         return {
             "page_count": page_count,
-            "full_text": full_text,
+            "full_text": buf.getvalue(),
             "pages": pages_data,
-            "sections": [section.model_dump() for section in structure.sections],
-            "chunks": [chunk.model_dump() for chunk in structure.chunks],
-            "metadata": structure.metadata,
-            "contract_type_hints": structure.contract_type_hints
+            "page_text_map": page_text_map,
+            "page_offsets": page_offsets,
+            "doc": doc,
         }
     
-    def process_docx(self, file_path: str) -> Dict:
+    def _extract_pages_parallel(self, file_path: str, page_count: int) -> List[Dict]:
         """
-        Process DOCX document.
+        Extract page data across worker processes in contiguous page ranges.
+        
+        PyMuPDF is not thread-safe, so large documents are split over a
+        process pool; small ones are cheaper to extract in-process.
+        
+        Args:
+            file_path: Path to PDF file
+            page_count: Number of pages in the document
+            
+        Returns:
+            Page data for every page, in page order
+        """
+        workers = self._extraction_workers(page_count)
+        step = -(-page_count // workers)  # Ceiling division
+        ranges = [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+        
+        results = _get_extraction_pool().map(
+            _extract_page_range,
+            [file_path] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges]
+        )
+        return [page_data for page_range in results for page_data in page_range]
+    
+    @staticmethod
+    def _extraction_workers(page_count: int) -> int:
+        """Number of page ranges to split a PDF into for the extraction pool"""
+        return max(1, min(settings.pdf_extraction_workers, os.cpu_count() or 1, page_count))
+    
+    def _extract_docx(self, file_path: str) -> Dict:
+        """
+        Extract text from a DOCX, grouping paragraphs into simulated pages.
         
         Args:
             file_path: Path to DOCX file
             
         Returns:
-            Same structure as process_pdf
+            Same structure as _extract_pdf, without "doc"
         """
         doc = DocxDocument(file_path)
         
@@ -204,22 +478,32 @@ class DocumentProcessor:
         pages_data = []
         full_text_parts = []
         page_text_map = {}
+        page_offsets: Dict[int, Tuple[int, int]] = {}
+        text_pos = 0  # Length of "\n\n".join(full_text_parts) so far
+        page_start = 0
         
         # DOCX doesn't have explicit pages, so we'll simulate pages
         # by grouping paragraphs (rough approximation)
         paragraphs = doc.paragraphs
         current_page = 1
         current_page_text = []
+        current_page_chars = 0
         chars_per_page = 2000  # Approximate characters per page
         
         for para in paragraphs:
             text = para.text.strip()
             if text:
+                if full_text_parts:
+                    text_pos += 2  # "\n\n" separator
+                if not current_page_text:
+                    page_start = text_pos
                 current_page_text.append(text)
+                current_page_chars += len(text)
                 full_text_parts.append(text)
+                text_pos += len(text)
                 
                 # If we've accumulated enough text, consider it a new page
-                if sum(len(p) for p in current_page_text) >= chars_per_page:
+                if current_page_chars >= chars_per_page:
                     page_text = "\n".join(current_page_text)
                     pages_data.append({
                         "page_number": current_page,
@@ -227,8 +511,10 @@ class DocumentProcessor:
                         "blocks": [{"text": page_text, "bbox": None, "page": current_page}]
                     })
                     page_text_map[current_page] = page_text
+                    page_offsets[current_page] = (page_start, text_pos)
                     current_page += 1
                     current_page_text = []
+                    current_page_chars = 0
         
         # Add remaining text as last page
         if current_page_text:
@@ -239,123 +525,179 @@ class DocumentProcessor:
                 "blocks": [{"text": page_text, "bbox": None, "page": current_page}]
             })
             page_text_map[current_page] = page_text
+            page_offsets[current_page] = (page_start, text_pos)
         
         full_text = "\n\n".join(full_text_parts)
         page_count = len(pages_data) if pages_data else 1
         
-        # Use LLM to structure the document
-        structure = self._structure_with_llm(full_text, page_text_map)
+        return {
+            "page_count": page_count,
+            "full_text": full_text,
+            "pages": pages_data,
+            "page_text_map": page_text_map,
+            "page_offsets": page_offsets,
+        }
+    
+    def _build_result(
+        self,
+        extracted: Dict,
+        structure: DocumentStructure,
+        pdf_doc: Optional[Union[fitz.Document, str]] = None
+    ) -> Dict:
+        """
+        Validate the LLM structure against the extracted pages and build the result dict.
         
-        # Post-processing validation: Ensure all pages are covered (for DOCX too)
-        pages_with_chunks = set(chunk.page_number for chunk in structure.chunks)
-        all_pages = set(page_text_map.keys())
-        missing_pages = all_pages - pages_with_chunks
+        Args:
+            extracted: Output of _extract_pdf / _extract_docx
+            structure: DocumentStructure returned by the LLM
+            pdf_doc: Open PDF document (or its path), used to locate chunk coordinates (None for DOCX)
+            
+        Returns:
+            Result dict as documented in process_pdf
+        """
+        # Validate against the full page map so pages dropped by truncation are covered too
+        self._ensure_all_pages_chunked(structure, extracted["page_text_map"])
         
-        # If pages are missing, add fallback chunks for those pages
-        if missing_pages:
-            logger.warning(
-                f"LLM did not process pages {sorted(missing_pages)}. Adding fallback chunks.",
-                extra={"missing_pages": sorted(missing_pages)}
-            )
-            for page_num in sorted(missing_pages):
-                page_text = page_text_map[page_num]
-                if page_text.strip():
-                    fallback_chunks = self._create_fallback_chunks_for_page(
-                        page_num, page_text, structure.chunks
-                    )
-                    structure.chunks.extend(fallback_chunks)
+        # Extract coordinates for chunks
+        if pdf_doc is not None:
+            structure.chunks = self._extract_chunk_coordinates(pdf_doc, structure.chunks, extracted["pages"])
         
         # Update detected contract type
         if structure.contract_type_hints:
             self.detected_contract_type = structure.contract_type_hints[0]
         
         return {
-            "page_count": page_count,
-            "full_text": full_text,
-            "pages": pages_data,
+            "page_count": extracted["page_count"],
+            "full_text": extracted["full_text"],
+            "pages": extracted["pages"],
             "sections": [section.model_dump() for section in structure.sections],
             "chunks": [chunk.model_dump() for chunk in structure.chunks],
             "metadata": structure.metadata,
             "contract_type_hints": structure.contract_type_hints
         }
     
-    def _structure_with_llm(self, full_text: str, page_text_map: Dict[int, str]) -> DocumentStructure:
+    def _structure_with_llm(
+        self,
+        full_text: str,
+        page_text_map: Dict[int, str],
+        page_offsets: Optional[Dict[int, Tuple[int, int]]] = None
+    ) -> DocumentStructure:
         """
         Use LLM to intelligently structure the document.
         
         Args:
             full_text: Complete document text
             page_text_map: Map of page numbers to page text
+            page_offsets: Map of page numbers to (start, end) positions in full_text
+            
+        Returns:
+            DocumentStructure with sections, chunks, and metadata
+        """
+        if not settings.use_llm_structuring and self._is_well_structured(full_text, len(page_text_map)):
+            return self._structure_with_rules(full_text, page_text_map, page_offsets)
+        
+        page_text_map, messages = self._build_structuring_messages(full_text, page_text_map, page_offsets)
+        
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                response_model=DocumentStructure,
+                temperature=0.1,  # Low temperature for consistency
+            )
+            return self._validate_structure(response)
+            
+        except Exception as e:
+            return self._fallback_structure(page_text_map, e)
+    
+    async def _structure_with_llm_async(
+        self,
+        full_text: str,
+        page_text_map: Dict[int, str],
+        page_offsets: Optional[Dict[int, Tuple[int, int]]] = None,
+        rate_limiter: Optional[_TokenRateLimiter] = None
+    ) -> DocumentStructure:
+        """
+        Async variant of _structure_with_llm for concurrent processing.
+        
+        Args:
+            full_text: Complete document text
+            page_text_map: Map of page numbers to page text
+            page_offsets: Map of page numbers to (start, end) positions in full_text
+            rate_limiter: Optional shared tokens-per-minute limiter
             
         Returns:
             DocumentStructure with sections, chunks, and metadata
         """
+        if not settings.use_llm_structuring and self._is_well_structured(full_text, len(page_text_map)):
+            return self._structure_with_rules(full_text, page_text_map, page_offsets)
+        
+        page_text_map, messages = self._build_structuring_messages(full_text, page_text_map, page_offsets)
+        
+        try:
+            if rate_limiter:
+                # ~4 characters per token is close enough for budgeting
+                await rate_limiter.acquire(sum(len(m["content"]) for m in messages) // 4)
+            
+            response = await self.async_client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                response_model=DocumentStructure,
+                temperature=0.1,  # Low temperature for consistency
+            )
+            return self._validate_structure(response)
+            
+        except Exception as e:
+            return self._fallback_structure(page_text_map, e)
+    
+    def _build_structuring_messages(
+        self,
+        full_text: str,
+        page_text_map: Dict[int, str],
+        page_offsets: Optional[Dict[int, Tuple[int, int]]] = None
+    ) -> Tuple[Dict[int, str], List[Dict]]:
+        """
+        Truncate the document to the LLM context budget and build the chat messages.
+        
+        Args:
+            full_text: Complete document text
+            page_text_map: Map of page numbers to page text
+            page_offsets: Map of page numbers to (start, end) positions in full_text
+            
+        Returns:
+            Tuple of (possibly truncated page_text_map, chat messages)
+        """
+        # Page boundaries recorded at extraction time; recompute only when unavailable
+        if page_offsets is None:
+            page_offsets = self._compute_page_offsets(page_text_map)
+        
         # Truncate if too long (LLM context limits)
         max_chars = 200000  # ~50K tokens, safe for GPT-4o-mini
         if len(full_text) > max_chars:
-            # Rebuild full_text and page_text_map with truncation
-            accumulated = 0
+            # Slice once and trim the page maps to the pages that start inside the slice
+            full_text = full_text[:max_chars]
             new_page_map = {}
-            new_full_text_parts = []
+            new_page_offsets = {}
             
-            for page_num in sorted(page_text_map.keys()):
-                page_text = page_text_map[page_num]
-                if accumulated + len(page_text) <= max_chars:
-                    new_page_map[page_num] = page_text
-                    new_full_text_parts.append(page_text)
-                    accumulated += len(page_text) + 2  # +2 for "\n\n"
-                else:
-                    remaining = max_chars - accumulated
-                    if remaining > 0:
-                        truncated_text = page_text[:remaining]
-                        new_page_map[page_num] = truncated_text
-                        new_full_text_parts.append(truncated_text)
+            for page_num, (start, end) in page_offsets.items():
+                if start >= max_chars:
                     break
+                if end <= max_chars:
+                    new_page_map[page_num] = page_text_map[page_num]
+                else:
+                    end = max_chars
+                    new_page_map[page_num] = page_text_map[page_num][:end - start]
+                new_page_offsets[page_num] = (start, end)
             
-            full_text = "\n\n".join(new_full_text_parts)
             page_text_map = new_page_map
+            page_offsets = new_page_offsets
         
-        # Build context for LLM about page boundaries
-        page_boundaries = []
-        char_pos = 0
-        for page_num in sorted(page_text_map.keys()):
-            page_text = page_text_map[page_num]
-            page_boundaries.append({
-                "page": page_num,
-                "start": char_pos,
-                "end": char_pos + len(page_text)
-            })
-            char_pos += len(page_text) + 2  # +2 for "\n\n"
+        # Build context for LLM about page boundaries; "page:start:end" keeps this
+        # section to a few tokens per page
+        page_boundaries = ";".join(
+            f"{page_num}:{start}:{end}" for page_num, (start, end) in page_offsets.items()
+        )
         
-        system_prompt = """You are a document analysis expert. Analyze this contract document and extract:
-
-1. **Sections**: Identify all major sections (e.g., TERMINATION, LIABILITY, PAYMENT TERMS, etc.) with their page numbers and character positions in the text.
-
-2. **Semantic Chunks**: Break the text into semantic chunks. Each chunk should be a COMPLETE semantic unit:
-   - A complete clause (not split mid-sentence)
-   - A complete definition
-   - A complete paragraph with full meaning
-   - Do NOT create arbitrary fixed-size chunks
-   - Preserve context - each chunk should make sense on its own
-   - **CRITICAL**: You MUST create chunks for ALL pages, even if content appears similar or duplicate
-   - **CRITICAL**: Do NOT skip any pages - every page must have at least one chunk
-
-3. **Metadata**: Extract document metadata:
-   - Document type (e.g., "SaaS Agreement", "Vendor Contract")
-   - Parties involved (if mentioned)
-   - Key dates
-   - Any other relevant metadata
-
-4. **Contract Type Hints**: Identify what type of contract this appears to be:
-   - vendor_procurement
-   - service_agreement
-   - saas_technology
-   - government_contract
-   - employment
-   - generic
-
-Be precise with page numbers and character positions. Each chunk should reference the correct page number based on where that text appears in the document. Ensure you process every single page of the document."""
-
         # Get total page count for validation
         total_pages = len(page_text_map)
         page_numbers = sorted(page_text_map.keys())
@@ -364,7 +706,7 @@ Be precise with page numbers and character positions. Each chunk should referenc
 
 {full_text}
 
-Page boundaries (character positions):
+Page boundaries (page:start:end, semicolon-separated):
 {page_boundaries}
 
 **IMPORTANT**: This document has {total_pages} pages (pages {min(page_numbers)} to {max(page_numbers)}). 
@@ -372,102 +714,232 @@ You MUST create chunks for ALL {total_pages} pages. Do not skip any pages, even
 
 Extract sections, create semantic chunks, and provide metadata."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_model=DocumentStructure,
-                temperature=0.1,  # Low temperature for consistency
-            )
+        messages = [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        return page_text_map, messages
+    
+    @staticmethod
+    def _compute_page_offsets(page_text_map: Dict[int, str]) -> Dict[int, Tuple[int, int]]:
+        """
+        Compute (start, end) positions of each page in the "\n\n"-joined full text.
+        
+        Args:
+            page_text_map: Map of page numbers to page text
+            
+        Returns:
+            Map of page numbers to (start, end) positions
+        """
+        page_offsets = {}
+        char_pos = 0
+        for page_num in sorted(page_text_map.keys()):
+            page_text = page_text_map[page_num]
+            page_offsets[page_num] = (char_pos, char_pos + len(page_text))
+            char_pos += len(page_text) + 2  # +2 for "\n\n"
+        return page_offsets
+    
+    def _is_well_structured(self, full_text: str, page_count: int) -> bool:
+        """
+        Check whether clause markers and section headers are dense enough to
+        structure the document with regexes alone.
+        
+        Args:
+            full_text: Complete document text
+            page_count: Number of pages
             
-            structure = response.model_dump()
-            structure_obj = DocumentStructure(**structure)
-            
-            # Post-processing validation: Ensure all pages are covered
-            pages_with_chunks = set(chunk.page_number for chunk in structure_obj.chunks)
-            all_pages = set(page_text_map.keys())
-            missing_pages = all_pages - pages_with_chunks
-            
-            # If pages are missing, add fallback chunks for those pages
-            if missing_pages:
-                logger.warning(
-                    f"LLM did not process pages {sorted(missing_pages)}. Adding fallback chunks.",
-                    extra={"missing_pages": sorted(missing_pages)}
-                )
-                for page_num in sorted(missing_pages):
-                    page_text = page_text_map[page_num]
-                    if page_text.strip():
-                        # Create fallback chunks for missing pages
-                        fallback_chunks = self._create_fallback_chunks_for_page(
-                            page_num, page_text, structure_obj.chunks
-                        )
-                        structure_obj.chunks.extend(fallback_chunks)
-            
-            return structure_obj
+        Returns:
+            True if the document has section headers and enough markers per page
+        """
+        headers = len(_SECTION_HEADER_RE.findall(full_text))
+        if not headers:
+            return False
+        
+        markers = len(_CLAUSE_MARKER_RE.findall(full_text))
+        return (markers + headers) / max(page_count, 1) >= settings.structure_min_markers_per_page
+    
+    def _structure_with_rules(
+        self,
+        full_text: str,
+        page_text_map: Dict[int, str],
+        page_offsets: Optional[Dict[int, Tuple[int, int]]] = None
+    ) -> DocumentStructure:
+        """
+        Structure a well-marked document without the LLM.
+        
+        Sections run from one all-caps header to the next; chunks come from the
+        clause-marker chunker, tagged with the section in effect on each page.
+        
+        Args:
+            full_text: Complete document text
+            page_text_map: Map of page numbers to page text
+            page_offsets: Map of page numbers to (start, end) positions in full_text
             
-        except Exception as e:
-            # Fallback: Create basic structure if LLM fails
-            # Split into pages as chunks
-            chunks = []
-            for page_num, page_text in page_text_map.items():
-                # Simple sentence-based chunking as fallback
-                sentences = re.split(r'(?<=[.!?])\s+', page_text)
-                current_chunk = ""
-                chunk_num = 0
-                
-                for sentence in sentences:
-                    if len(current_chunk) + len(sentence) < 1000:  # Max chunk size
-                        current_chunk += sentence + " "
-                    else:
-                        if current_chunk.strip():
-                            chunks.append(DocumentChunk(
-                                chunk_id=f"chunk_{page_num}_{chunk_num}",
-                                text=current_chunk.strip(),
-                                page_number=page_num,
-                                section_name="Unknown",
-                                chunk_type="clause",
-                                context_before="",
-                                context_after=""
-                            ))
-                            chunk_num += 1
-                        current_chunk = sentence + " "
-                
-                # Add remaining chunk
-                if current_chunk.strip():
-                    chunks.append(DocumentChunk(
-                        chunk_id=f"chunk_{page_num}_{chunk_num}",
-                        text=current_chunk.strip(),
-                        page_number=page_num,
-                        section_name="Unknown",
-                        chunk_type="clause",
-                        context_before="",
-                        context_after=""
-                    ))
-            
-            return DocumentStructure(
-                sections=[],
-                chunks=chunks,
-                metadata={"error": str(e)},
-                contract_type_hints=[]
+        Returns:
+            DocumentStructure with sections, chunks, and keyword-based contract type
+        """
+        if page_offsets is None:
+            page_offsets = self._compute_page_offsets(page_text_map)
+        
+        page_numbers = list(page_offsets.keys())
+        page_starts = [start for start, _ in page_offsets.values()]
+        
+        def page_at(pos: int) -> int:
+            return page_numbers[max(bisect.bisect_right(page_starts, pos) - 1, 0)]
+        
+        headers = list(_SECTION_HEADER_RE.finditer(full_text))
+        sections = []
+        for i, header in enumerate(headers):
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(full_text)
+            sections.append(DocumentSection.model_construct(
+                section_name=header.group().strip(),
+                page_number=page_at(header.start()),
+                start_char=header.start(),
+                end_char=end,
+                content=full_text[header.start():end]
+            ))
+        
+        chunks = []
+        section_starts = [section.start_char for section in sections]
+        for page_num, page_text in page_text_map.items():
+            if not page_text.strip():
+                continue
+            # Section in effect at the end of the page (the last header seen so far)
+            page_end = page_offsets[page_num][1]
+            section_idx = bisect.bisect_right(section_starts, page_end) - 1
+            section_name = sections[section_idx].section_name if section_idx >= 0 else "Unknown"
+            chunks.extend(self._create_fallback_chunks_for_page(page_num, page_text, chunks, section_name))
+        
+        contract_type = self._classify_contract_type(full_text)
+        logger.info(
+            f"Structured document with rules: {len(sections)} sections, {len(chunks)} chunks",
+            extra={"sections": len(sections), "chunks": len(chunks), "contract_type": contract_type}
+        )
+        
+        return DocumentStructure(
+            sections=sections,
+            chunks=chunks,
+            metadata={"structuring": "rules"},
+            contract_type_hints=[contract_type]
+        )
+    
+    @staticmethod
+    def _classify_contract_type(full_text: str) -> str:
+        """
+        Guess the contract type from keyword counts.
+        
+        Args:
+            full_text: Complete document text
+            
+        Returns:
+            Contract type with the most keyword hits, or "generic"
+        """
+        text = full_text.lower()
+        scores = {
+            contract_type: sum(text.count(keyword) for keyword in keywords)
+            for contract_type, keywords in _CONTRACT_TYPE_KEYWORDS.items()
+        }
+        best_type = max(scores, key=scores.get)
+        return best_type if scores[best_type] else "generic"
+    
+    def _validate_structure(self, response: DocumentStructure) -> DocumentStructure:
+        """
+        Re-validate the LLM response.
+        
+        Args:
+            response: DocumentStructure returned by instructor
+            
+        Returns:
+            Validated DocumentStructure
+        """
+        # instructor keeps the raw completion around; report prompt-cache hits
+        usage = getattr(getattr(response, "_raw_response", None), "usage", None)
+        prompt_details = getattr(usage, "prompt_tokens_details", None)
+        if prompt_details is not None:
+            logger.debug(
+                f"Structuring prompt used {usage.prompt_tokens} tokens ({prompt_details.cached_tokens} cached)",
+                extra={"prompt_tokens": usage.prompt_tokens, "cached_tokens": prompt_details.cached_tokens}
+            )
+        
+        structure = response.model_dump()
+        return DocumentStructure(**structure)
+    
+    def _ensure_all_pages_chunked(self, structure: DocumentStructure, page_text_map: Dict[int, str]) -> None:
+        """
+        Add fallback chunks, in place, for pages the LLM did not cover.
+        
+        Args:
+            structure: DocumentStructure whose chunks are extended
+            page_text_map: Map of page numbers to page text
+        """
+        pages_with_chunks = {chunk.page_number for chunk in structure.chunks}
+        missing_pages = page_text_map.keys() - pages_with_chunks
+        
+        # If pages are missing, add fallback chunks for those pages
+        if missing_pages:
+            logger.warning(
+                f"LLM did not process pages {sorted(missing_pages)}. Adding fallback chunks.",
+                extra={"missing_pages": sorted(missing_pages)}
             )
+            for page_num in sorted(missing_pages):
+                page_text = page_text_map[page_num]
+                if page_text.strip():
+                    fallback_chunks = self._create_fallback_chunks_for_page(
+                        page_num, page_text, structure.chunks
+                    )
+                    structure.chunks.extend(fallback_chunks)
+    
+    def _fallback_structure(self, page_text_map: Dict[int, str], error: Exception) -> DocumentStructure:
+        """
+        Create basic structure if LLM fails.
+        
+        Args:
+            page_text_map: Map of page numbers to page text
+            error: Exception raised by the LLM call
+            
+        Returns:
+            DocumentStructure with sentence-based chunks and no sections
+        """
+        # Split into pages as chunks (built from our own text, so skip validation)
+        chunks = []
+        for page_num, page_text in page_text_map.items():
+            # Simple sentence-based chunking as fallback
+            sentences = re.split(r'(?<=[.!?])\s+', page_text)
+            for chunk_num, chunk_text in enumerate(self._pack_sentences(sentences, 1000)):
+                chunks.append(DocumentChunk.model_construct(
+                    chunk_id=f"chunk_{page_num}_{chunk_num}",
+                    text=chunk_text,
+                    page_number=page_num,
+                    section_name="Unknown",
+                    chunk_type="clause",
+                    context_before="",
+                    context_after="",
+                    coordinates=None
+                ))
+        
+        return DocumentStructure(
+            sections=[],
+            chunks=chunks,
+            metadata={"error": str(error)},
+            contract_type_hints=[]
+        )
     
     def _create_fallback_chunks_for_page(
         self, 
         page_num: int, 
         page_text: str, 
-        existing_chunks: List[DocumentChunk]
+        existing_chunks: List[DocumentChunk],
+        section_name: Optional[str] = None
     ) -> List[DocumentChunk]:
         """
         Create fallback chunks for a page that was missed by LLM.
-        Uses intelligent chunking: detects clause markers, then sentence-based splitting.
+        Splits at clause markers, and at sentence ends when a clause is too long.
         
         Args:
             page_num: Page number
             page_text: Text content of the page
             existing_chunks: Existing chunks to infer section context from
+            section_name: Section to tag chunks with (inferred from existing_chunks if None)
         
         Returns:
             List of DocumentChunk objects
@@ -475,143 +947,97 @@ Extract sections, create semantic chunks, and provide metadata."""
         chunks = []
         
         # Try to infer section name from nearby pages
-        section_name = "Unknown"
-        for chunk in existing_chunks:
-            if abs(chunk.page_number - page_num) <= 1:
-                section_name = chunk.section_name
-                break
-        
-        # First, try to split by clause markers (A., B., C., etc. or numbered lists)
-        # Pattern: Letter/number followed by period and space (e.g., "B. ", "1. ", "A. ")
-        # Look for patterns like "B. ", "C. ", "1. " at start of line or after whitespace
-        clause_marker_pattern = r'(\n\s*|^)([A-Z]\.\s+|\d+\.\s+)'
-        
-        # Find all clause markers and their positions
-        matches = list(re.finditer(clause_marker_pattern, page_text))
-        
-        # If we found clause markers, split by them
-        if len(matches) >= 2:  # Need at least 2 markers to split
-            clause_parts = []
-            last_pos = 0
-            
-            # First part (before first marker)
-            if matches[0].start() > 0:
-                first_text = page_text[:matches[0].start()].strip()
-                if first_text:
-                    clause_parts.append(("", first_text))
-            
-            # Process each clause
-            for i, match in enumerate(matches):
-                marker = match.group(2).strip()  # The actual marker (B., C., etc.)
-                start_pos = match.end()
-                # End position is start of next marker, or end of text
-                end_pos = matches[i+1].start() if i+1 < len(matches) else len(page_text)
-                clause_text = page_text[start_pos:end_pos].strip()
-                
-                if clause_text:
-                    clause_parts.append((marker, clause_text))
-            
-            # If no markers found, clause_parts will be empty, fall through to sentence-based
-            if not clause_parts:
-                matches = []
-            
-            # Create chunks from clause parts
-            if clause_parts:
-                for chunk_num, (marker, clause_text) in enumerate(clause_parts):
-                    # Further split if clause is too long (by sentences)
-                    if len(clause_text) > 1500:
-                        sentences = re.split(r'(?<=[.!?])\s+', clause_text)
-                        current_subchunk = ""
-                        subchunk_num = 0
-                        
-                        for sentence in sentences:
-                            sentence = sentence.strip()
-                            if not sentence:
-                                continue
-                            
-                            if len(current_subchunk) + len(sentence) > 1500:
-                                if current_subchunk.strip():
-                                    chunks.append(DocumentChunk(
-                                        chunk_id=f"chunk_{page_num}_{chunk_num}_{subchunk_num}",
-                                        text=current_subchunk.strip(),
-                                        page_number=page_num,
-                                        section_name=section_name,
-                                        chunk_type="clause",
-                                        context_before="",
-                                        context_after=""
-                                    ))
-                                    subchunk_num += 1
-                                current_subchunk = sentence + " "
-                            else:
-                                current_subchunk += sentence + " "
-                        
-                        if current_subchunk.strip():
-                            chunks.append(DocumentChunk(
-                                chunk_id=f"chunk_{page_num}_{chunk_num}_{subchunk_num}",
-                                text=current_subchunk.strip(),
-                                page_number=page_num,
-                                section_name=section_name,
-                                chunk_type="clause",
-                                context_before="",
-                                context_after=""
-                            ))
-                    else:
-                        # Clause is reasonable size, use as-is
-                        chunks.append(DocumentChunk(
-                            chunk_id=f"chunk_{page_num}_{chunk_num}",
-                            text=clause_text,
-                            page_number=page_num,
-                            section_name=section_name,
-                            chunk_type="clause",
-                            context_before="",
-                            context_after=""
-                        ))
-                return chunks
-        else:
-            # No clause markers found, use sentence-based chunking
-            sentences = re.split(r'(?<=[.!?])\s+', page_text)
-            current_chunk = ""
-            chunk_num = 0
-            
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if not sentence:
-                    continue
-                
-                # If adding this sentence would exceed reasonable chunk size, finalize current chunk
-                if len(current_chunk) + len(sentence) > 1500:  # Max chunk size
-                    if current_chunk.strip():
-                        chunks.append(DocumentChunk(
-                            chunk_id=f"chunk_{page_num}_{chunk_num}",
-                            text=current_chunk.strip(),
-                            page_number=page_num,
-                            section_name=section_name,
-                            chunk_type="clause",
-                            context_before="",
-                            context_after=""
-                        ))
-                        chunk_num += 1
-                    current_chunk = sentence + " "
-                else:
-                    current_chunk += sentence + " "
+        if section_name is None:
+            section_name = "Unknown"
+            for chunk in existing_chunks:
+                if abs(chunk.page_number - page_num) <= 1:
+                    section_name = chunk.section_name
+                    break
+        
+        # Single pass over clause markers (A., B., 1., ...) and sentence ends: a marker
+        # always closes the current chunk, a sentence end closes it only once the
+        # chunk would grow past the size limit
+        max_chars = 1500
+        spans = []
+        chunk_start = 0
+        last_end = None  # End of the last complete sentence in the current chunk
+        last_next = 0  # Where the text after that sentence starts
+        
+        boundaries = (
+            (match.start(), match.end(), match.lastgroup == "marker")
+            for match in _FALLBACK_BOUNDARY_RE.finditer(page_text)
+        )
+        text_len = len(page_text)
+        for end, next_start, is_marker in itertools.chain(boundaries, [(text_len, text_len, True)]):
+            if last_end is not None and end - chunk_start > max_chars:
+                spans.append((chunk_start, last_end))
+                chunk_start = last_next
             
-            # Add remaining chunk
-            if current_chunk.strip():
-                chunks.append(DocumentChunk(
-                    chunk_id=f"chunk_{page_num}_{chunk_num}",
-                    text=current_chunk.strip(),
+            if is_marker:
+                spans.append((chunk_start, end))
+                chunk_start = next_start
+                last_end = None
+            else:
+                last_end, last_next = end, next_start
+        
+        for start, end in spans:
+            chunk_text = page_text[start:end].strip()
+            if chunk_text:
+                chunks.append(DocumentChunk.model_construct(
+                    chunk_id=f"chunk_{page_num}_{len(chunks)}",
+                    text=chunk_text,
                     page_number=page_num,
                     section_name=section_name,
                     chunk_type="clause",
                     context_before="",
-                    context_after=""
+                    context_after="",
+                    coordinates=None
                 ))
         
         return chunks
     
+    @staticmethod
+    def _pack_sentences(sentences: List[str], max_chars: int) -> List[str]:
+        """
+        Greedily pack consecutive sentences into chunks of roughly max_chars.
+        
+        Sentences are collected in a list and joined once per chunk, so packing
+        stays linear in the page length.
+        
+        Args:
+            sentences: Sentences in document order
+            max_chars: Chunk size at which a new chunk is started
+            
+        Returns:
+            List of chunk texts
+        """
+        packed = []
+        parts: List[str] = []
+        current_len = 0
+        
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            
+            # If adding this sentence would exceed the chunk size, finalize current chunk
+            if parts and current_len + len(sentence) > max_chars:
+                packed.append("".join(parts).strip())
+                parts = []
+                current_len = 0
+            
+            parts.append(sentence)
+            parts.append(" ")
+            current_len += len(sentence) + 1
+        
+        if parts:
+            packed.append("".join(parts).strip())
+        
+        return packed
+    
     def _extract_chunk_coordinates(
         self, 
-        file_path: str, 
+        doc: Union[fitz.Document, str], 
         chunks: List[DocumentChunk],
         pages_data: List[Dict]
     ) -> List[DocumentChunk]:
@@ -619,15 +1045,18 @@ Extract sections, create semantic chunks, and provide metadata."""
         Extract coordinates for chunks from PDF.
         
         Args:
-            file_path: Path to PDF file
+            doc: Open PDF document, or a path to open (and close) here
             chunks: List of DocumentChunk objects
             pages_data: List of page data with blocks and coordinates
             
         Returns:
             List of DocumentChunk objects with coordinates populated
         """
+        owns_doc = isinstance(doc, str)
         try:
-            doc = fitz.open(file_path)
+            if owns_doc:
+                with FITZ_LOCK:
+                    doc = fitz.open(doc)
             updated_chunks = []
             
             for chunk in chunks:
@@ -642,15 +1071,15 @@ Extract sections, create semantic chunks, and provide metadata."""
                     updated_chunks.append(chunk)
                     continue
                 
-                page = doc[page_num - 1]
                 # Search for the chunk text (first 100 chars for efficiency)
                 search_text = chunk.text[:100].strip()
                 if not search_text:
                     updated_chunks.append(chunk)
                     continue
                 
-                # Find text instances
-                text_instances = page.search_for(search_text)
+                # Find text instances (locked per chunk, see FITZ_LOCK)
+                with FITZ_LOCK:
+                    text_instances = doc[page_num - 1].search_for(search_text)
                 
                 if text_instances:
                     # Use first match's coordinates
@@ -665,12 +1094,71 @@ Extract sections, create semantic chunks, and provide metadata."""
                 
                 updated_chunks.append(chunk)
             
-            doc.close()
             return updated_chunks
             
         except Exception as e:
             logger.error(f"Error extracting coordinates: {e}", exc_info=True)
             return chunks
+        finally:
+            if owns_doc and not isinstance(doc, str):
+                with FITZ_LOCK:
+                    doc.close()
+    
+    def locate_snippets(
+        self,
+        file_path: str,
+        snippets: List[Tuple[int, str]]
+    ) -> List[Optional[Dict]]:
+        """
+        Find highlight coordinates for several text snippets, opening the PDF once.
+        
+        Each page's text layer is extracted once and searched for every snippet
+        on it (first 100 chars of each).
+        
+        Args:
+            file_path: Path to PDF file
+            snippets: (page_number, text) pairs, page numbers 1-indexed
+            
+        Returns:
+            Per snippet, None if not found, else a dict with the union bbox
+            {x0, y0, x1, y1, page} and "rects": every matched line rect as
+            [x0, y0, x1, y1]
+        """
+        results: List[Optional[Dict]] = [None] * len(snippets)
+        try:
+            with FITZ_LOCK:
+                doc = fitz.open(file_path)
+                try:
+                    page_count = len(doc)
+                    current_page, page, textpage = None, None, None
+                    # Visit snippets in page order so each textpage is built once
+                    for i in sorted(range(len(snippets)), key=lambda i: snippets[i][0]):
+                        page_number, text = snippets[i]
+                        search_text = (text or "")[:100].strip()
+                        if not search_text or not 1 <= page_number <= page_count:
+                            continue
+                        
+                        if page_number != current_page:
+                            current_page = page_number
+                            page = doc[page_number - 1]
+                            textpage = page.get_textpage()
+                        
+                        rects = page.search_for(search_text, textpage=textpage)
+                        if rects:
+                            results[i] = {
+                                "x0": float(min(r.x0 for r in rects)),
+                                "y0": float(min(r.y0 for r in rects)),
+                                "x1": float(max(r.x1 for r in rects)),
+                                "y1": float(max(r.y1 for r in rects)),
+                                "page": page_number,
+                                "rects": [[float(r.x0), float(r.y0), float(r.x1), float(r.y1)] for r in rects]
+                            }
+                finally:
+                    doc.close()
+        except Exception as e:
+            logger.warning(f"Error locating snippets in {file_path}: {e}", extra={"file_path": file_path}, exc_info=True)
+        
+        return results
     
     def get_page_coordinates(self, file_path: str, page_number: int, text_snippet: str) -> Optional[Dict]:
         """
@@ -685,28 +1173,21 @@ Extract sections, create semantic chunks, and provide metadata."""
             Dict with bbox coordinates or None if not found
         """
         try:
-            doc = fitz.open(file_path)
-            if page_number > len(doc):
-                doc.close()
+            # Search for first 100 chars; repeat lookups are served from the cache
+            bbox = _search_page_cached(
+                file_path, os.path.getmtime(file_path), page_number, text_snippet[:100]
+            )
+            if bbox is None:
                 return None
             
-            page = doc[page_number - 1]
-            text_instances = page.search_for(text_snippet[:100])  # Search for first 100 chars
-            
-            if text_instances:
-                # Return first match's coordinates
-                bbox = text_instances[0]
-                doc.close()
-                return {
-                    "x0": bbox.x0,
-                    "y0": bbox.y0,
-                    "x1": bbox.x1,
-                    "y1": bbox.y1,
-                    "page": page_number
-                }
-            
-            doc.close()
-            return None
+            x0, y0, x1, y1 = bbox
+            return {
+                "x0": x0,
+                "y0": y0,
+                "x1": x1,
+                "y1": y1,
+                "page": page_number
+            }
             
         except Exception:
             return None
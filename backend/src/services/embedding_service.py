@@ -2,18 +2,159 @@
 Embedding service for generating text embeddings using OpenAI.
 Centralized service for consistent embedding generation across the application.
 """
-from typing import List, Optional
-from openai import OpenAI, APIError, RateLimitError as OpenAIRateLimitError
+import asyncio
+import functools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+import httpx
+import tiktoken
+from openai import OpenAI, AsyncOpenAI, APIError, RateLimitError as OpenAIRateLimitError
 import hashlib
 
 from src.core.config import settings
 from src.core.cache import cache_service, hash_text
-from src.core.retry import retry_with_backoff, RetryConfig
+from src.core.retry import retry_with_backoff, retry_async_with_backoff, RetryConfig, parse_retry_after
 from src.core.logging_config import get_logger
 from src.core.exceptions import ExternalServiceError, RateLimitError
 
 logger = get_logger(__name__)
 
+# Shared across the process: HTTP/2 multiplexes concurrent sub-batch requests over
+# pooled connections instead of opening a new TLS connection per request
+_http_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=64, max_connections=64),
+    timeout=30.0
+)
+_async_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=64, max_connections=64),
+    timeout=30.0
+)
+
+
+def _retry_after_from(error: OpenAIRateLimitError) -> Optional[float]:
+    """Seconds OpenAI asked us to wait on a 429 (None falls back to exponential backoff)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    
+    retry_after_ms = parse_retry_after(response.headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000
+    return parse_retry_after(response.headers.get("retry-after"))
+
+
+def _translate_openai_error(error: APIError, context: str) -> Exception:
+    """Map an OpenAI API error to our RateLimitError / retryable ExternalServiceError"""
+    if isinstance(error, OpenAIRateLimitError):
+        logger.warning(f"Rate limit hit for {context}: {error}")
+        return RateLimitError(
+            message="OpenAI rate limit exceeded",
+            retry_after=_retry_after_from(error)
+        )
+    
+    logger.error(f"OpenAI API error in {context}: {error}")
+    return ExternalServiceError(
+        service="OpenAI Embeddings",
+        message=str(error),
+        retryable=True
+    )
+
+
+# Embedding models accept 8192 tokens; keep a little headroom
+_MAX_EMBEDDING_TOKENS = 8000
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Tokenizer for an embedding model, loaded once per process"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _truncate_to_token_limit(text: str, model: str, byte_length: int) -> str:
+    """Cut text (byte_length UTF-8 bytes) to _MAX_EMBEDDING_TOKENS tokens of the model's tokenizer"""
+    # Every token covers at least one UTF-8 byte, so short texts can't be over the limit
+    if byte_length <= _MAX_EMBEDDING_TOKENS:
+        return text
+    
+    encoding = _get_encoding(model)
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= _MAX_EMBEDDING_TOKENS:
+        return text
+    return encoding.decode(tokens[:_MAX_EMBEDDING_TOKENS])
+
+
+# Retry configuration for batch embeddings
+_BATCH_RETRY_CONFIG = RetryConfig(
+    max_retries=3,
+    initial_delay=1.0,
+    max_delay=10.0,
+    retryable_exceptions=[APIError, OpenAIRateLimitError, RateLimitError, ConnectionError, TimeoutError]
+)
+
+
+class _EmbeddingCoalescer:
+    """
+    Groups concurrent aget_embedding calls into shared batch requests.
+    
+    The first call for a model opens a short window; every call that arrives
+    before it closes (or until max_items is reached) is embedded in the same
+    aget_embeddings_batch call, and each caller's future gets its own vector.
+    """
+    
+    def __init__(self, service: "EmbeddingService", max_wait: float, max_items: int):
+        self._service = service
+        self.max_wait = max_wait
+        self.max_items = max_items
+        self._pending: Dict[str, List[Tuple[str, asyncio.Future]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()  # Keep flush tasks referenced until done
+    
+    async def submit(self, text: str, model: str) -> Optional[List[float]]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        pending = self._pending.setdefault(model, [])
+        pending.append((text, future))
+        if len(pending) >= self.max_items:
+            self._flush(model)
+        elif len(pending) == 1:
+            self._timers[model] = loop.call_later(self.max_wait, self._flush, model)
+        
+        return await future
+    
+    def _flush(self, model: str) -> None:
+        timer = self._timers.pop(model, None)
+        if timer is not None:
+            timer.cancel()
+        
+        batch = self._pending.pop(model, None)
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch, model))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]], model: str) -> None:
+        try:
+            embeddings = await self._service.aget_embeddings_batch(
+                [text for text, _ in batch], model, raise_on_error=True
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
 
 class EmbeddingService:
     """Service for generating text embeddings using OpenAI"""
@@ -21,10 +162,18 @@ class EmbeddingService:
     def __init__(self):
         """Initialize embedding service"""
         if settings.openai_api_key:
-            self.client = OpenAI(api_key=settings.openai_api_key)
+            self.client = OpenAI(api_key=settings.openai_api_key, http_client=_http_client)
+            self.async_client = AsyncOpenAI(api_key=settings.openai_api_key, http_client=_async_http_client)
         else:
             self.client = None
+            self.async_client = None
             logger.warning("OpenAI API key not set. Embeddings will be disabled.")
+        
+        self._coalescer = _EmbeddingCoalescer(
+            self,
+            max_wait=settings.embedding_coalesce_window_ms / 1000,
+            max_items=settings.embedding_coalesce_max_items
+        )
     
     def get_embedding(self, text: str, model: str = "text-embedding-3-small") -> Optional[List[float]]:
         """
@@ -35,162 +184,301 @@ class EmbeddingService:
             model: Embedding model to use (default: text-embedding-3-small)
         
         Returns:
-            Embedding vector or None if error
+            Embedding vector, or None for empty text / no client
+        
+        Raises:
+            ExternalServiceError, RateLimitError: If embedding fails after retries
         """
         if not self.client or not text:
             return None
         
-        # Build cache key
-        text_hash = hash_text(text)
-        cache_key = f"embedding:{model}:{text_hash}"
-        
-        # Try cache first
-        cached = cache_service.get(cache_key)
-        if cached is not None:
-            return cached
-        
-        # Truncate if too long (OpenAI limit is 8192 tokens, ~32K chars)
-        max_chars = 32000
-        original_text = text
-        if len(text) > max_chars:
-            text = text[:max_chars]
-        
-        # Retry configuration for OpenAI API calls
-        retry_config = RetryConfig(
-            max_retries=3,
-            initial_delay=1.0,
-            max_delay=10.0,
-            retryable_exceptions=[APIError, OpenAIRateLimitError, ConnectionError, TimeoutError]
-        )
+        # Single code path: cache, truncation and retries live in the batch method
+        return self.get_embeddings_batch([text], model, raise_on_error=True)[0]
+    
+    def get_embeddings_batch(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-3-small",
+        raise_on_error: bool = False
+    ) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for multiple texts.
         
-        def _call_openai():
-            try:
-                response = self.client.embeddings.create(
-                    model=model,
-                    input=text
-                )
-                return response.data[0].embedding
-            except OpenAIRateLimitError as e:
-                logger.warning(f"Rate limit hit for embeddings: {e}")
-                raise RateLimitError(
-                    message="OpenAI rate limit exceeded",
-                    retry_after=60
-                ) from e
-            except APIError as e:
-                logger.error(f"OpenAI API error: {e}")
-                raise ExternalServiceError(
-                    service="OpenAI Embeddings",
-                    message=str(e),
-                    retryable=True
-                ) from e
+        Args:
+            texts: List of texts to embed
+            model: Embedding model to use
+            raise_on_error: Raise ExternalServiceError/RateLimitError instead of
+                returning None for a failed sub-batch
         
-        # Apply retry decorator
-        _call_openai_with_retry = retry_with_backoff(
-            _call_openai,
-            config=retry_config,
-            operation_name="get_embedding"
-        )
+        Returns:
+            List of embedding vectors (None for failed embeddings)
+        """
+        if not self.client:
+            return [None] * len(texts)
         
-        try:
-            embedding = _call_openai_with_retry()
-            
-            # Cache embedding (7 days)
-            cache_service.set(cache_key, embedding, ttl=settings.cache_embedding_ttl)
-            
-            logger.debug(f"Generated embedding for text (hash: {text_hash[:8]}...)")
-            return embedding
-        except (ExternalServiceError, RateLimitError):
-            # Re-raise our custom exceptions
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error generating embedding: {e}", exc_info=True)
-            raise ExternalServiceError(
-                service="OpenAI Embeddings",
-                message=f"Unexpected error: {str(e)}",
-                retryable=False
-            ) from e
+        embeddings, sub_batches = self._partition_batch(texts, model)
+        if not sub_batches:
+            return embeddings
+        
+        # Send sub-batches concurrently
+        if len(sub_batches) == 1:
+            results = [self._embed_sub_batch(sub_batches[0][1], model, raise_on_error=raise_on_error)]
+        else:
+            workers = min(settings.embedding_max_concurrency, len(sub_batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    lambda batch: self._embed_sub_batch(batch, model, jitter=True, raise_on_error=raise_on_error),
+                    [batch for _, batch, _ in sub_batches]
+                ))
+        
+        self._merge_batch_results(embeddings, sub_batches, results)
+        return embeddings
     
-    def get_embeddings_batch(self, texts: List[str], model: str = "text-embedding-3-small") -> List[Optional[List[float]]]:
+    async def aget_embedding(self, text: str, model: str = "text-embedding-3-small") -> Optional[List[float]]:
         """
-        Generate embeddings for multiple texts.
+        Async get_embedding; concurrent calls are micro-batched into one request.
+        
+        Args:
+            text: Text to embed
+            model: Embedding model to use (default: text-embedding-3-small)
+        
+        Returns:
+            Embedding vector, or None for empty text / no client
+        
+        Raises:
+            ExternalServiceError, RateLimitError: If embedding fails after retries
+        """
+        if not self.async_client or not text:
+            return None
+        
+        # Provider errors reach every coalesced caller through its future
+        return await self._coalescer.submit(text, model)
+    
+    async def aget_embeddings_batch(
+        self,
+        texts: List[str],
+        model: str = "text-embedding-3-small",
+        raise_on_error: bool = False
+    ) -> List[Optional[List[float]]]:
+        """
+        Async variant of get_embeddings_batch: sub-batches run on the event loop
+        via AsyncOpenAI, bounded by settings.embedding_max_concurrency.
         
         Args:
             texts: List of texts to embed
             model: Embedding model to use
+            raise_on_error: Raise ExternalServiceError/RateLimitError instead of
+                returning None for a failed sub-batch
         
         Returns:
             List of embedding vectors (None for failed embeddings)
         """
-        if not self.client:
+        if not self.async_client:
             return [None] * len(texts)
         
+        # Cache round-trips use the sync Redis client, keep them off the event loop
+        embeddings, sub_batches = await asyncio.to_thread(self._partition_batch, texts, model)
+        if not sub_batches:
+            return embeddings
+        
+        semaphore = asyncio.Semaphore(settings.embedding_max_concurrency)
+        results = await asyncio.gather(*(
+            self._aembed_sub_batch(batch, model, semaphore, raise_on_error) for _, batch, _ in sub_batches
+        ))
+        
+        await asyncio.to_thread(self._merge_batch_results, embeddings, sub_batches, results)
+        return embeddings
+    
+    def _partition_batch(
+        self,
+        texts: List[str],
+        model: str
+    ) -> Tuple[List[Optional[List[float]]], List[Tuple[List[int], List[str], List[str]]]]:
+        """
+        Fill cached embeddings and split the misses into provider-sized sub-batches.
+        
+        Args:
+            texts: List of texts to embed
+            model: Embedding model to use
+        
+        Returns:
+            Tuple of (embeddings with cache hits filled in, sub-batches of
+            (original indices, truncated texts, cache keys))
+        """
         # Filter out empty texts and track indices
         valid_texts = []
         valid_indices = []
+        cache_keys = []
         
         for i, text in enumerate(texts):
             if text and text.strip():
-                # Truncate if needed
-                max_chars = 32000
-                if len(text) > max_chars:
-                    text = text[:max_chars]
-                valid_texts.append(text)
+                # Encode once for both the cache key and the truncation length check
+                raw = text.encode()
+                # Key on the untruncated text
+                cache_keys.append(f"embedding:{model}:{hash_text(raw)}")
+                valid_texts.append(_truncate_to_token_limit(text, model, len(raw)))
                 valid_indices.append(i)
         
+        embeddings = [None] * len(texts)
         if not valid_texts:
-            return [None] * len(texts)
+            return embeddings, []
         
-        # Retry configuration for batch embeddings
-        retry_config = RetryConfig(
-            max_retries=3,
-            initial_delay=1.0,
-            max_delay=10.0,
-            retryable_exceptions=[APIError, OpenAIRateLimitError, ConnectionError, TimeoutError]
-        )
+        # One MGET for every key; only cache misses go to OpenAI
+        miss_positions = []
+        for pos, cached in enumerate(cache_service.mget(cache_keys)):
+            if cached is not None:
+                embeddings[valid_indices[pos]] = cached
+            else:
+                miss_positions.append(pos)
+        
+        if len(miss_positions) < len(valid_texts):
+            logger.debug(f"{len(valid_texts) - len(miss_positions)} of {len(valid_texts)} batch embeddings served from cache")
+        
+        size = settings.embedding_sub_batch_size
+        sub_batches = []
+        for i in range(0, len(miss_positions), size):
+            positions = miss_positions[i:i + size]
+            sub_batches.append((
+                [valid_indices[pos] for pos in positions],
+                [valid_texts[pos] for pos in positions],
+                [cache_keys[pos] for pos in positions]
+            ))
+        return embeddings, sub_batches
+    
+    def _merge_batch_results(
+        self,
+        embeddings: List[Optional[List[float]]],
+        sub_batches: List[Tuple[List[int], List[str], List[str]]],
+        results: List[Optional[list]]
+    ) -> None:
+        """
+        Write sub-batch results into embeddings (by original index) and cache them.
+        
+        Args:
+            embeddings: Output list, updated in place
+            sub_batches: Sub-batches from _partition_batch
+            results: OpenAI embedding data per sub-batch (None for failed sub-batches)
+        """
+        new_entries = {}
+        for (indices, _, keys), response_data in zip(sub_batches, results):
+            if response_data is None:
+                continue
+            for idx, key, embedding_data in zip(indices, keys, response_data):
+                embeddings[idx] = embedding_data.embedding
+                new_entries[key] = embedding_data.embedding
+        
+        # Cache new embeddings (7 days)
+        cache_service.mset(new_entries, ttl=settings.cache_embedding_ttl)
+        
+        logger.debug(f"Generated {len(new_entries)} embeddings in {len(sub_batches)} sub-batch(es)")
+    
+    def _embed_sub_batch(
+        self,
+        batch: List[str],
+        model: str,
+        jitter: bool = False,
+        raise_on_error: bool = False
+    ) -> Optional[list]:
+        """
+        Embed one sub-batch with retries.
+        
+        Args:
+            batch: Non-empty, already truncated texts
+            model: Embedding model to use
+            jitter: Sleep a few ms first so concurrent sub-batches don't fire at once
+            raise_on_error: Raise instead of returning None on failure
+        
+        Returns:
+            OpenAI embedding data in input order, or None if the sub-batch failed
+        """
+        if jitter:
+            time.sleep(random.uniform(0, 0.05))
         
         def _call_openai_batch():
             try:
                 response = self.client.embeddings.create(
                     model=model,
-                    input=valid_texts
+                    input=batch
                 )
                 return response.data
-            except OpenAIRateLimitError as e:
-                logger.warning(f"Rate limit hit for batch embeddings: {e}")
-                raise RateLimitError(
-                    message="OpenAI rate limit exceeded",
-                    retry_after=60
-                ) from e
             except APIError as e:
-                logger.error(f"OpenAI API error in batch: {e}")
-                raise ExternalServiceError(
-                    service="OpenAI Embeddings",
-                    message=str(e),
-                    retryable=True
-                ) from e
+                raise _translate_openai_error(e, "batch embeddings") from e
         
         # Apply retry wrapper
         _call_openai_batch_with_retry = retry_with_backoff(
             _call_openai_batch,
-            config=retry_config,
+            config=_BATCH_RETRY_CONFIG,
             operation_name="get_embeddings_batch"
         )
         
         try:
-            response_data = _call_openai_batch_with_retry()
-            
-            # Map results back to original indices
-            embeddings = [None] * len(texts)
-            for idx, embedding_data in zip(valid_indices, response_data):
-                embeddings[idx] = embedding_data.embedding
-            
-            logger.debug(f"Generated {len(valid_texts)} embeddings in batch")
-            return embeddings
+            return _call_openai_batch_with_retry()
         except (ExternalServiceError, RateLimitError):
-            # Return None for all on error (caller should handle)
-            logger.error("Failed to generate batch embeddings after retries")
-            return [None] * len(texts)
+            if raise_on_error:
+                raise
+            # Return None for the sub-batch on error (caller should handle)
+            logger.error(f"Failed to generate {len(batch)} batch embeddings after retries")
+            return None
         except Exception as e:
             logger.error(f"Unexpected error in batch embeddings: {e}", exc_info=True)
-            return [None] * len(texts)
-
+            if raise_on_error:
+                raise ExternalServiceError(
+                    service="OpenAI Embeddings",
+                    message=f"Unexpected error: {str(e)}",
+                    retryable=False
+                ) from e
+            return None
+    
+    async def _aembed_sub_batch(
+        self,
+        batch: List[str],
+        model: str,
+        semaphore: asyncio.Semaphore,
+        raise_on_error: bool = False
+    ) -> Optional[list]:
+        """
+        Async variant of _embed_sub_batch, holding semaphore for the request.
+        
+        Args:
+            batch: Non-empty, already truncated texts
+            model: Embedding model to use
+            semaphore: Bounds concurrent requests
+            raise_on_error: Raise instead of returning None on failure
+        
+        Returns:
+            OpenAI embedding data in input order, or None if the sub-batch failed
+        """
+        async def _call_openai_batch():
+            async with semaphore:
+                try:
+                    response = await self.async_client.embeddings.create(
+                        model=model,
+                        input=batch
+                    )
+                    return response.data
+                except APIError as e:
+                    raise _translate_openai_error(e, "batch embeddings") from e
+        
+        # Apply retry wrapper (backoff sleeps happen outside the semaphore)
+        _call_openai_batch_with_retry = retry_async_with_backoff(
+            _call_openai_batch,
+            config=_BATCH_RETRY_CONFIG,
+            operation_name="aget_embeddings_batch"
+        )
+        
+        try:
+            return await _call_openai_batch_with_retry()
+        except (ExternalServiceError, RateLimitError):
+            if raise_on_error:
+                raise
+            logger.error(f"Failed to generate {len(batch)} batch embeddings after retries")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error in batch embeddings: {e}", exc_info=True)
+            if raise_on_error:
+                raise ExternalServiceError(
+                    service="OpenAI Embeddings",
+                    message=f"Unexpected error: {str(e)}",
+                    retryable=False
+                ) from e
+            return None
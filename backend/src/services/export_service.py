@@ -3,12 +3,14 @@ Export Service
 
 Handles exporting clauses, checklists, and contracts in various formats.
 """
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from datetime import datetime
-from io import BytesIO, StringIO
+from io import BytesIO
 import json
 import csv
 from pathlib import Path
+from functools import lru_cache
+from operator import attrgetter
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
@@ -26,9 +28,103 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.pdfgen import canvas
 import fitz  # PyMuPDF
 
+from src.core.fitz_lock import FITZ_LOCK
 from src.models.clause import Clause
 from src.models.document import Document
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+def _risk_bucket(risk_score: Optional[float]) -> str:
+    """Risk bucket for a score: "high" (>= 70), "med" (>= 40), else "low"."""
+    score = risk_score or 0
+    if score >= 70:
+        return "high"
+    if score >= 40:
+        return "med"
+    return "low"
+
+
+# Clause columns read by the JSON/CSV exports, fetched in one call per clause.
+# Callers should eager-load Clause.document (selectinload) so reading it
+# doesn't lazy-load one document per clause.
+_CLAUSE_FIELDS = attrgetter(
+    "id",
+    "document_id",
+    "document",
+    "clause_type",
+    "extracted_text",
+    "page_number",
+    "section",
+    "risk_score",
+    "risk_flags",
+    "risk_reasoning",
+    "created_at",
+)
+
+# Checklist palette, parsed once at import
+_PALETTE = {
+    "title": "#1a1a1a",
+    "text": "#2c3e50",
+    "muted": "#7f8c8d",
+    "footer": "#95a5a6",
+    "grid": "#bdc3c7",
+    "summary_bg": "#ecf0f1",
+    "red": "#e74c3c",
+    "orange": "#f39c12",
+    "green": "#27ae60",
+    "high_bg": "#fee",
+    "med_bg": "#fff9e6",
+    "low_bg": "#e8f8f5",
+}
+_COLORS = {name: colors.HexColor(value) for name, value in _PALETTE.items()}
+
+# Highlight colors per risk bucket: red, orange, yellow
+_HIGHLIGHT_COLORS = {
+    "high": (1.0, 0.2, 0.2),
+    "med": (1.0, 0.8, 0.2),
+    "low": (1.0, 1.0, 0.2),
+}
+
+
+@lru_cache(maxsize=1024)
+def _header_markup(clause_type: str, page_number: int) -> str:
+    """Checklist item header; clause types and pages repeat across clauses"""
+    return f"<b>{clause_type}</b> (Page {page_number})"
+
+
+def _json_default(obj):
+    """Serialize datetime/UUID for the stdlib json fallback the way orjson does"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+# Rows buffered per chunk yielded by ExportService.iter_clauses_csv
+_CSV_CHUNK_ROWS = 256
+
+
+class _ChunkBuffer:
+    """Write target for csv.writer that hands back what was written so far"""
+
+    def __init__(self):
+        self._chunks: List[str] = []
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._chunks)
+
+    def write(self, s: str) -> None:
+        self._chunks.append(s)
+
+    def drain(self) -> bytes:
+        data = "".join(self._chunks).encode("utf-8")
+        self._chunks.clear()
+        return data
+
 
 class ExportService:
     """Service for exporting contract analysis results"""
@@ -36,39 +132,139 @@ class ExportService:
     def __init__(self):
         self.styles = getSampleStyleSheet()
 
+        # Checklist styles, shared by every export
+        self._title_style = ParagraphStyle(
+            "TitleStyle",
+            parent=self.styles["Heading1"],
+            fontSize=18,
+            textColor=_COLORS["title"],
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName="Helvetica-Bold",
+        )
+
+        self._heading_style = ParagraphStyle(
+            "HeadingStyle",
+            parent=self.styles["Heading2"],
+            fontSize=12,
+            textColor=_COLORS["text"],
+            spaceAfter=8,
+            spaceBefore=12,
+            fontName="Helvetica-Bold",
+        )
+
+        self._subtitle_style = ParagraphStyle(
+            "SubtitleStyle",
+            parent=self.styles["Normal"],
+            fontSize=11,
+            textColor=_COLORS["muted"],
+            alignment=TA_CENTER,
+            spaceAfter=20,
+        )
+
+        # Risk section headings, registered on the stylesheet once
+        for name, color in (
+            ("RiskHeadingHigh", "red"),
+            ("RiskHeadingMedium", "orange"),
+            ("RiskHeadingLow", "green"),
+        ):
+            self.styles.add(
+                ParagraphStyle(
+                    name=name,
+                    parent=self.styles["Heading3"],
+                    fontSize=11,
+                    textColor=_COLORS[color],
+                    spaceAfter=6,
+                    spaceBefore=10,
+                    fontName="Helvetica-Bold",
+                )
+            )
+
+        self._footer_style = ParagraphStyle(
+            "FooterStyle",
+            parent=self.styles["Normal"],
+            fontSize=8,
+            textColor=_COLORS["footer"],
+            alignment=TA_CENTER,
+        )
+
+        self._summary_table_style = TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (0, -1), _COLORS["summary_bg"]),
+                ("TEXTCOLOR", (0, 0), (-1, -1), _COLORS["text"]),
+                ("ALIGN", (0, 0), (-1, -1), "LEFT"),
+                ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+                ("FONTSIZE", (0, 0), (-1, -1), 10),
+                ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
+                ("TOPPADDING", (0, 0), (-1, -1), 8),
+                ("GRID", (0, 0), (-1, -1), 1, _COLORS["grid"]),
+            ]
+        )
+
+        # One checklist item style per risk bucket, differing only in background
+        self._item_styles = {
+            bucket: TableStyle(
+                [
+                    ("BACKGROUND", (0, 0), (-1, -1), _COLORS[f"{bucket}_bg"]),
+                    ("TEXTCOLOR", (0, 0), (-1, -1), _COLORS["text"]),
+                    ("ALIGN", (0, 0), (0, -1), "CENTER"),
+                    ("ALIGN", (1, 0), (1, -1), "LEFT"),
+                    ("ALIGN", (2, 0), (2, -1), "RIGHT"),
+                    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
+                    ("FONTSIZE", (0, 0), (-1, -1), 9),
+                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
+                    ("TOPPADDING", (0, 0), (-1, -1), 6),
+                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                ]
+            )
+            for bucket in ("high", "med", "low")
+        }
+
+    @staticmethod
+    def _truncate(text: Optional[str], limit: int) -> str:
+        """Cut text to limit characters with an ellipsis ("" for None)"""
+        if not text:
+            return ""
+        return text[:limit] + "..." if len(text) > limit else text
+
     def export_clauses_json(self, clauses: List[Clause]) -> bytes:
         """Export clauses as JSON"""
         clauses_data = []
         for clause in clauses:
-            # Safely get document name
-            doc_name = None
-            try:
-                if clause.document:
-                    doc_name = clause.document.name
-            except Exception:
-                # If document relationship is not loaded, use document_id
-                doc_name = str(clause.document_id)
-            
+            (cid, did, document, ctype, text, page, section,
+             score, flags, reasoning, created) = _CLAUSE_FIELDS(clause)
+            # UUID and datetime values are serialized natively by orjson
             clauses_data.append({
-                "id": str(clause.id),
-                "document_id": str(clause.document_id),
-                "document_name": doc_name,
-                "clause_type": clause.clause_type,
-                "extracted_text": clause.extracted_text or "",
-                "page_number": clause.page_number,
-                "section_name": clause.section,
-                "risk_score": clause.risk_score or 0,
-                "risk_flags": clause.risk_flags or [],
-                "risk_reasoning": clause.risk_reasoning or "",
-                "created_at": clause.created_at.isoformat() if clause.created_at else None,
+                "id": cid,
+                "document_id": did,
+                "document_name": document.name if document else str(did),
+                "clause_type": ctype,
+                "extracted_text": text or "",
+                "page_number": page,
+                "section_name": section,
+                "risk_score": score or 0,
+                "risk_flags": flags or [],
+                "risk_reasoning": reasoning or "",
+                "created_at": created,
             })
-        return json.dumps(clauses_data, indent=2, ensure_ascii=False).encode("utf-8")
+        if orjson is not None:
+            return orjson.dumps(clauses_data, default=str, option=orjson.OPT_INDENT_2)
+        return json.dumps(
+            clauses_data, indent=2, ensure_ascii=False, default=_json_default
+        ).encode("utf-8")
 
     def export_clauses_csv(self, clauses: List[Clause]) -> bytes:
         """Export clauses as CSV"""
-        # Use StringIO for text-based CSV, then encode to bytes
-        buffer = StringIO()
-        writer = csv.writer(buffer)
+        return b"".join(self.iter_clauses_csv(clauses))
+
+    def iter_clauses_csv(self, clauses: List[Clause]) -> Iterator[bytes]:
+        """
+        Export clauses as CSV, yielding UTF-8 chunks for streaming responses.
+
+        Memory stays bounded by _CSV_CHUNK_ROWS rows regardless of export size.
+        """
+        buffer = _ChunkBuffer()
+        writer = csv.writer(buffer, lineterminator="\n")
         
         # Header
         writer.writerow([
@@ -83,33 +279,28 @@ class ExportService:
             "Risk Reasoning",
         ])
         
+        yield buffer.drain()
+        
         # Data rows
-        for clause in clauses:
-            risk_flags_str = ", ".join(clause.risk_flags) if clause.risk_flags else ""
-            # Safely get document name
-            doc_name = ""
-            try:
-                if clause.document:
-                    doc_name = clause.document.name
-            except Exception:
-                # If document relationship is not loaded, use document_id
-                doc_name = str(clause.document_id)
-            
+        for i, clause in enumerate(clauses, 1):
+            (cid, did, document, ctype, extracted, page, section,
+             score, flags, reasoning, _) = _CLAUSE_FIELDS(clause)
             writer.writerow([
-                str(clause.id),
-                doc_name,
-                clause.clause_type,
-                clause.page_number,
-                clause.section or "",
-                clause.risk_score or 0,
-                risk_flags_str,
-                (clause.extracted_text[:500] + "...") if clause.extracted_text and len(clause.extracted_text) > 500 else (clause.extracted_text or ""),
-                clause.risk_reasoning or "",
+                str(cid),
+                document.name if document else str(did),
+                ctype,
+                page,
+                section or "",
+                score or 0,
+                ", ".join(flags) if flags else "",
+                self._truncate(extracted, 500),
+                reasoning or "",
             ])
+            if i % _CSV_CHUNK_ROWS == 0:
+                yield buffer.drain()
         
-        buffer.seek(0)
-        # Encode string to bytes
-        return buffer.getvalue().encode("utf-8")
+        if buffer.pending:
+            yield buffer.drain()
 
     def export_review_checklist_pdf(
         self,
@@ -128,143 +319,47 @@ class ExportService:
         )
         story = []
 
-        # Styles
-        title_style = ParagraphStyle(
-            "TitleStyle",
-            parent=self.styles["Heading1"],
-            fontSize=18,
-            textColor=colors.HexColor("#1a1a1a"),
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName="Helvetica-Bold",
-        )
-
-        heading_style = ParagraphStyle(
-            "HeadingStyle",
-            parent=self.styles["Heading2"],
-            fontSize=12,
-            textColor=colors.HexColor("#2c3e50"),
-            spaceAfter=8,
-            spaceBefore=12,
-            fontName="Helvetica-Bold",
-        )
-
         # Title
-        story.append(Paragraph("Contract Review Checklist", title_style))
+        story.append(Paragraph("Contract Review Checklist", self._title_style))
         if document_name:
             story.append(
-                Paragraph(
-                    f"<i>Document: {document_name}</i>",
-                    ParagraphStyle(
-                        "SubtitleStyle",
-                        parent=self.styles["Normal"],
-                        fontSize=11,
-                        textColor=colors.HexColor("#7f8c8d"),
-                        alignment=TA_CENTER,
-                        spaceAfter=20,
-                    ),
-                )
+                Paragraph(f"<i>Document: {document_name}</i>", self._subtitle_style)
             )
         story.append(Spacer(1, 0.2 * inch))
 
-        # Summary statistics
-        total_clauses = len(clauses)
-        high_risk = sum(1 for c in clauses if (c.risk_score or 0) >= 70)
-        medium_risk = sum(1 for c in clauses if 40 <= (c.risk_score or 0) < 70)
-        low_risk = sum(1 for c in clauses if (c.risk_score or 0) < 40)
+        # Group by risk level in a single pass
+        buckets: Dict[str, List[Clause]] = {"high": [], "med": [], "low": []}
+        for c in clauses:
+            buckets[_risk_bucket(c.risk_score)].append(c)
+        high_risk_clauses = buckets["high"]
+        medium_risk_clauses = buckets["med"]
+        low_risk_clauses = buckets["low"]
 
+        # Summary statistics
         summary_data = [
-            ["Total Clauses", str(total_clauses)],
-            ["High Risk (≥70)", str(high_risk)],
-            ["Medium Risk (40-69)", str(medium_risk)],
-            ["Low Risk (<40)", str(low_risk)],
+            ["Total Clauses", str(len(clauses))],
+            ["High Risk (≥70)", str(len(high_risk_clauses))],
+            ["Medium Risk (40-69)", str(len(medium_risk_clauses))],
+            ["Low Risk (<40)", str(len(low_risk_clauses))],
         ]
 
         summary_table = Table(summary_data, colWidths=[3 * inch, 2 * inch])
-        summary_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#ecf0f1")),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#2c3e50")),
-                    ("ALIGN", (0, 0), (-1, -1), "LEFT"),
-                    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 10),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 8),
-                    ("TOPPADDING", (0, 0), (-1, -1), 8),
-                    ("GRID", (0, 0), (-1, -1), 1, colors.HexColor("#bdc3c7")),
-                ]
-            )
-        )
+        summary_table.setStyle(self._summary_table_style)
         story.append(summary_table)
         story.append(Spacer(1, 0.3 * inch))
 
         # Checklist items
-        story.append(Paragraph("Review Items", heading_style))
-
-        # Group by risk level
-        high_risk_clauses = [c for c in clauses if (c.risk_score or 0) >= 70]
-        medium_risk_clauses = [c for c in clauses if 40 <= (c.risk_score or 0) < 70]
-        low_risk_clauses = [c for c in clauses if (c.risk_score or 0) < 40]
-
-        # High risk section
-        if high_risk_clauses:
-            story.append(
-                Paragraph(
-                    "High Priority (Risk Score ≥ 70)",
-                    ParagraphStyle(
-                        "RiskHeadingStyle",
-                        parent=self.styles["Heading3"],
-                        fontSize=11,
-                        textColor=colors.HexColor("#e74c3c"),
-                        spaceAfter=6,
-                        spaceBefore=10,
-                        fontName="Helvetica-Bold",
-                    ),
-                )
-            )
-            for clause in high_risk_clauses:
-                self._add_checklist_item(story, clause, colors.HexColor("#fee"))
-                story.append(Spacer(1, 0.1 * inch))
-
-        # Medium risk section
-        if medium_risk_clauses:
-            story.append(
-                Paragraph(
-                    "Medium Priority (Risk Score 40-69)",
-                    ParagraphStyle(
-                        "RiskHeadingStyle",
-                        parent=self.styles["Heading3"],
-                        fontSize=11,
-                        textColor=colors.HexColor("#f39c12"),
-                        spaceAfter=6,
-                        spaceBefore=10,
-                        fontName="Helvetica-Bold",
-                    ),
-                )
-            )
-            for clause in medium_risk_clauses:
-                self._add_checklist_item(story, clause, colors.HexColor("#fff9e6"))
-                story.append(Spacer(1, 0.1 * inch))
-
-        # Low risk section
-        if low_risk_clauses:
-            story.append(
-                Paragraph(
-                    "Low Priority (Risk Score < 40)",
-                    ParagraphStyle(
-                        "RiskHeadingStyle",
-                        parent=self.styles["Heading3"],
-                        fontSize=11,
-                        textColor=colors.HexColor("#27ae60"),
-                        spaceAfter=6,
-                        spaceBefore=10,
-                        fontName="Helvetica-Bold",
-                    ),
-                )
-            )
-            for clause in low_risk_clauses:
-                self._add_checklist_item(story, clause, colors.HexColor("#e8f8f5"))
-                story.append(Spacer(1, 0.1 * inch))
+        story.append(Paragraph("Review Items", self._heading_style))
+
+        # One heading and one table per non-empty risk section
+        for label, style_name, bucket, section_clauses in (
+            ("High Priority (Risk Score ≥ 70)", "RiskHeadingHigh", "high", high_risk_clauses),
+            ("Medium Priority (Risk Score 40-69)", "RiskHeadingMedium", "med", medium_risk_clauses),
+            ("Low Priority (Risk Score < 40)", "RiskHeadingLow", "low", low_risk_clauses),
+        ):
+            if section_clauses:
+                story.append(Paragraph(label, self.styles[style_name]))
+                story.append(self._checklist_table(section_clauses, bucket))
 
         # Footer
         story.append(Spacer(1, 0.3 * inch))
@@ -272,32 +367,52 @@ class ExportService:
             f"<i>Generated by ContractIQ on "
             f"{datetime.now().strftime('%B %d, %Y at %H:%M:%S')}</i>"
         )
-        story.append(
-            Paragraph(
-                footer_text,
-                ParagraphStyle(
-                    "FooterStyle",
-                    parent=self.styles["Normal"],
-                    fontSize=8,
-                    textColor=colors.HexColor("#95a5a6"),
-                    alignment=TA_CENTER,
-                ),
-            )
-        )
+        story.append(Paragraph(footer_text, self._footer_style))
 
         doc.build(story)
         buffer.seek(0)
         return buffer.getvalue()
 
-    def _add_checklist_item(
-        self, story: List, clause: Clause, bg_color: colors.HexColor
-    ):
-        """Add a checklist item for a clause"""
-                # Checkbox and clause info
+    def _checklist_table(self, clauses: List[Clause], bucket: str) -> Table:
+        """
+        Build a single table holding the checklist items of one risk section.
+
+        Items are separated by short white rows instead of being separate
+        Table flowables, so doc.build lays out one table per section.
+        """
+        rows: List[List[str]] = []
+        row_heights: List[Optional[float]] = []
+        separator_cmds = []
+        for clause in clauses:
+            if rows:
+                sep = len(rows)
+                rows.append(["", "", ""])
+                row_heights.append(0.1 * inch)
+                separator_cmds += [
+                    ("BACKGROUND", (0, sep), (-1, sep), colors.white),
+                    ("TOPPADDING", (0, sep), (-1, sep), 0),
+                    ("BOTTOMPADDING", (0, sep), (-1, sep), 0),
+                ]
+            item_rows = self._checklist_rows(clause)
+            rows.extend(item_rows)
+            row_heights.extend([None] * len(item_rows))
+
+        table = Table(
+            rows,
+            colWidths=[0.3 * inch, 4.5 * inch, 1.2 * inch],
+            rowHeights=row_heights,
+            spaceAfter=0.1 * inch,
+        )
+        table.setStyle(TableStyle(separator_cmds, parent=self._item_styles[bucket]))
+        return table
+
+    def _checklist_rows(self, clause: Clause) -> List[List[str]]:
+        """Checklist rows for a clause"""
+        # Checkbox and clause info
         item_data = [
             [
                 "☐",
-                f"<b>{clause.clause_type}</b> (Page {clause.page_number})",
+                _header_markup(clause.clause_type, clause.page_number),
                 f"Risk: {clause.risk_score or 0}/100",
             ],
             ["", f"<i>{clause.section or 'N/A'}</i>", ""],
@@ -307,29 +422,11 @@ class ExportService:
             flags_text = ", ".join(clause.risk_flags)
             item_data.append(["", f"<b>Flags:</b> {flags_text}", ""])
 
-        if clause.risk_reasoning:
-            reasoning_text = (clause.risk_reasoning[:200] + "...") if clause.risk_reasoning and len(clause.risk_reasoning) > 200 else (clause.risk_reasoning or "")
-            if reasoning_text:
-                item_data.append(["", f"<i>{reasoning_text}</i>", ""])
+        reasoning_text = self._truncate(clause.risk_reasoning, 200)
+        if reasoning_text:
+            item_data.append(["", f"<i>{reasoning_text}</i>", ""])
 
-        item_table = Table(item_data, colWidths=[0.3 * inch, 4.5 * inch, 1.2 * inch])
-        item_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), bg_color),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#2c3e50")),
-                    ("ALIGN", (0, 0), (0, -1), "CENTER"),
-                    ("ALIGN", (1, 0), (1, -1), "LEFT"),
-                    ("ALIGN", (2, 0), (2, -1), "RIGHT"),
-                    ("FONTNAME", (0, 0), (-1, -1), "Helvetica"),
-                    ("FONTSIZE", (0, 0), (-1, -1), 9),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-                    ("TOPPADDING", (0, 0), (-1, -1), 6),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
-        story.append(item_table)
+        return item_data
 
     def export_highlighted_contract_pdf(
         self, document_path: str, clauses: List[Clause]
@@ -339,50 +436,66 @@ class ExportService:
         Uses PyMuPDF to add annotations/highlights.
         """
         # Open the original PDF
-        doc = fitz.open(document_path)
+        with FITZ_LOCK:
+            doc = fitz.open(document_path)
+            page_count = len(doc)
 
-        # Group clauses by page
+        # Group clauses by page, dropping pages the file doesn't have
         clauses_by_page: Dict[int, List[Clause]] = {}
         for clause in clauses:
             page_num = clause.page_number - 1  # PyMuPDF is 0-indexed
-            if page_num not in clauses_by_page:
-                clauses_by_page[page_num] = []
-            clauses_by_page[page_num].append(clause)
-
-        # Highlight clauses on each page
-        for page_num, page_clauses in clauses_by_page.items():
-            if page_num >= len(doc):
-                continue
-
-            page = doc[page_num]
-
-            for clause in page_clauses:
-                # Determine highlight color based on risk score
-                risk_score = clause.risk_score or 0
-                if risk_score >= 70:
-                    color = (1.0, 0.2, 0.2)  # Red for high risk
-                elif risk_score >= 40:
-                    color = (1.0, 0.8, 0.2)  # Orange for medium risk
-                else:
-                    color = (1.0, 1.0, 0.2)  # Yellow for low risk
-
-                # Try to find and highlight the clause text
-                # Search for the clause text on the page
-                text_instances = page.search_for(clause.extracted_text[:100])
-                
-                if text_instances:
-                    # Highlight the first occurrence
-                    highlight = page.add_highlight_annot(text_instances[0])
-                    highlight.set_colors(stroke=color)
-                    highlight.set_opacity(0.3)
-                    highlight.update()
-                else:
-                    # If exact text not found, try to use coordinates if available
-                    # For now, we'll skip if text not found
-                    pass
-
-        # Save to bytes
-        pdf_bytes = doc.tobytes()
-        doc.close()
-        return pdf_bytes
+            if 0 <= page_num < page_count:
+                clauses_by_page.setdefault(page_num, []).append(clause)
+
+        # Highlight clauses page by page in document order. PyMuPDF is not
+        # thread-safe, so each page is processed under FITZ_LOCK (held per
+        # page so ingestion and other exports can interleave).
+        for page_num in sorted(clauses_by_page):
+            with FITZ_LOCK:
+                self._highlight_page(doc[page_num], clauses_by_page[page_num])
+
+        # Save to bytes, dropping unused objects and compressing streams
+        with FITZ_LOCK:
+            try:
+                return doc.tobytes(garbage=4, deflate=True, clean=True)
+            finally:
+                doc.close()
+
+    @staticmethod
+    def _highlight_page(page: fitz.Page, page_clauses: List[Clause]) -> None:
+        """Add one highlight annotation per risk bucket to a page (caller holds FITZ_LOCK)"""
+        # Text layer is extracted at most once per page, and only when a
+        # clause on it has no stored coordinates
+        textpage = None
+
+        # Collect matches per risk bucket so each color becomes one annotation
+        rects_by_bucket: Dict[str, List] = {}
+        for clause in page_clauses:
+            coords = clause.coordinates
+            if coords:
+                # Line rects stored at extraction time, no text search needed
+                # (older rows only carry the single bbox)
+                rects = coords.get("rects") or [
+                    [coords["x0"], coords["y0"], coords["x1"], coords["y1"]]
+                ]
+                text_instances = [fitz.Rect(rect) for rect in rects]
+            else:
+                # Search for the clause text on the page; every matched line
+                # rect is highlighted, not only the first one
+                if textpage is None:
+                    textpage = page.get_textpage()
+                text_instances = page.search_for(
+                    clause.extracted_text[:100], textpage=textpage
+                )
+            if text_instances:
+                rects_by_bucket.setdefault(
+                    _risk_bucket(clause.risk_score), []
+                ).extend(text_instances)
+            # If exact text not found, the clause is skipped
+
+        for bucket, rects in rects_by_bucket.items():
+            highlight = page.add_highlight_annot(rects)
+            highlight.set_colors(stroke=_HIGHLIGHT_COLORS[bucket])
+            highlight.set_opacity(0.3)
+            highlight.update()
 
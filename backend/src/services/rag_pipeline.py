@@ -8,7 +8,8 @@ This service implements:
 """
 from typing import List, Dict, Optional, TypedDict, Annotated
 from operator import add
-from openai import OpenAI
+import asyncio
+from openai import AsyncOpenAI
 from instructor import patch
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field, field_validator
@@ -21,6 +22,10 @@ from src.services.vector_store import VectorStore
 
 logger = get_logger(__name__)
 
+# Greeting-length questions are classified concurrently with retrieval, so the
+# classification is ready if retrieval comes back empty
+CONCURRENT_CLASSIFY_MAX_WORDS = 3
+
 
 class Citation(BaseModel):
     """Citation for a source chunk"""
@@ -88,6 +93,8 @@ class ContractIQState(TypedDict):
     retrieved_chunks: List[Dict]  # Chunks from vector search
     answer: str
     citations: List[Citation]
+    # Message type from the LLM classifier (set when classified during retrieval)
+    classification: Optional[str]
     error: Optional[str]
 
 
@@ -106,7 +113,7 @@ class RAGPipeline:
         if not settings.openai_api_key:
             raise ValueError("OpenAI API key not configured")
 
-        self.client = patch(OpenAI(api_key=settings.openai_api_key))
+        self.client = patch(AsyncOpenAI(api_key=settings.openai_api_key))
         self.vector_store = VectorStore()
         self.graph = self._build_graph()
 
@@ -125,7 +132,7 @@ class RAGPipeline:
 
         return workflow.compile()
 
-    def _retrieve_node(self, state: ContractIQState) -> ContractIQState:
+    async def _retrieve_node(self, state: ContractIQState) -> ContractIQState:
         """
         Retrieve relevant chunks from vector store.
 
@@ -163,7 +170,7 @@ class RAGPipeline:
 
         # Search vector store for actual questions
         n_results = 10  # Get top 10 chunks
-        results = self.vector_store.search(
+        search = self.vector_store.asearch(
             workspace_id=workspace_id,
             query=question,
             n_results=n_results,
@@ -172,6 +179,18 @@ class RAGPipeline:
             include_chunks=True
         )
 
+        # Greeting-length messages are often chit-chat that retrieves nothing;
+        # classify them while searching instead of after an empty search
+        classify_task = None
+        if len(question.split()) <= CONCURRENT_CLASSIFY_MAX_WORDS:
+            classify_task = asyncio.create_task(self._classify_question(question))
+        try:
+            results = await search
+        except BaseException:
+            if classify_task is not None:
+                classify_task.cancel()
+            raise
+
         # Filter by document_ids if specified
         if document_ids:
             results = [
@@ -179,6 +198,14 @@ class RAGPipeline:
                 if r.get("document_id") in document_ids
             ]
 
+        # The classification is only used when nothing was retrieved
+        classification = None
+        if classify_task is not None:
+            if results:
+                classify_task.cancel()
+            else:
+                classification = await classify_task
+
         # Filter by minimum similarity threshold (remove very low relevance chunks)
         # Keep chunks with similarity > -0.3, or top 5 if all are below threshold
         MIN_SIMILARITY_THRESHOLD = -0.3
@@ -199,10 +226,38 @@ class RAGPipeline:
         return {
             **state,
             "retrieved_chunks": results,
+            "classification": classification,
             "error": None
         }
 
-    def _generate_node(self, state: ContractIQState) -> ContractIQState:
+    async def _classify_question(self, question: str) -> str:
+        """
+        Classify a message as 'greeting', 'needs_context' or 'off_topic'.
+
+        Returns:
+            Lowercased classifier output, or "" if classification fails
+        """
+        try:
+            classification_response = await self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "Classify the user's message into one category:\n- 'greeting' - casual greetings (hi, hello, hey, etc.)\n- 'needs_context' - questions about contracts that need document context\n- 'off_topic' - questions not related to contracts\n\nRespond with ONLY the category name."
+                    },
+                    {
+                        "role": "user",
+                        "content": question
+                    }
+                ],
+                max_tokens=10,
+                temperature=0
+            )
+            return classification_response.choices[0].message.content.strip().lower()
+        except Exception:
+            return ""
+
+    async def _generate_node(self, state: ContractIQState) -> ContractIQState:
         """
         Generate answer using LLM with retrieved chunks.
 
@@ -218,51 +273,27 @@ class RAGPipeline:
 
         # If no chunks retrieved, use LLM to intelligently determine response type
         if not retrieved_chunks:
-            try:
-                # Use LLM to classify the question type
-                classification_response = self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": "Classify the user's message into one category:\n- 'greeting' - casual greetings (hi, hello, hey, etc.)\n- 'needs_context' - questions about contracts that need document context\n- 'off_topic' - questions not related to contracts\n\nRespond with ONLY the category name."
-                        },
-                        {
-                            "role": "user",
-                            "content": question
-                        }
-                    ],
-                    max_tokens=10,
-                    temperature=0
-                )
-
-                classification = classification_response.choices[0].message.content.strip(
-                ).lower()
+            # Use LLM to classify the question type (unless done during retrieval)
+            classification = state.get("classification")
+            if classification is None:
+                classification = await self._classify_question(question)
 
-                if "greeting" in classification:
-                    return {
-                        **state,
-                        "answer": "Hello! I'm here to help you understand your contracts. You can ask me questions like:\n\n• What are the termination terms?\n• What is the liability cap?\n• What are the payment terms?\n• Explain the confidentiality clause\n\nWhat would you like to know about your contracts?",
-                        "citations": [],
-                        "error": None
-                    }
-                elif "off_topic" in classification:
-                    return {
-                        **state,
-                        "answer": "I'm specialized in helping with contract analysis. Please ask me questions about your uploaded contracts, such as terms, clauses, liability, payment terms, etc.",
-                        "citations": [],
-                        "error": None
-                    }
-                else:
-                    # Needs context but no chunks found
-                    return {
-                        **state,
-                        "answer": "I couldn't find any relevant information to answer your question. Please try rephrasing your question or make sure you have documents uploaded in your workspace.",
-                        "citations": [],
-                        "error": "No relevant chunks found"
-                    }
-            except Exception as e:
-                # Fallback if classification fails
+            if "greeting" in classification:
+                return {
+                    **state,
+                    "answer": "Hello! I'm here to help you understand your contracts. You can ask me questions like:\n\n• What are the termination terms?\n• What is the liability cap?\n• What are the payment terms?\n• Explain the confidentiality clause\n\nWhat would you like to know about your contracts?",
+                    "citations": [],
+                    "error": None
+                }
+            elif "off_topic" in classification:
+                return {
+                    **state,
+                    "answer": "I'm specialized in helping with contract analysis. Please ask me questions about your uploaded contracts, such as terms, clauses, liability, payment terms, etc.",
+                    "citations": [],
+                    "error": None
+                }
+            else:
+                # Needs context but no chunks found (or classification failed)
                 return {
                     **state,
                     "answer": "I couldn't find any relevant information to answer your question. Please try rephrasing your question or make sure you have documents uploaded in your workspace.",
@@ -382,7 +413,7 @@ Answer the question using the sources above. In your response:
 
         try:
             # Generate structured answer using instructor
-            structured_answer: StructuredAnswer = self.client.chat.completions.create(
+            structured_answer: StructuredAnswer = await self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 response_model=StructuredAnswer,
                 messages=[
@@ -527,7 +558,7 @@ Answer the question using the sources above. In your response:
                 "error": str(e)
             }
 
-    def ask(
+    async def ask(
         self,
         question: str,
         workspace_id: str,
@@ -558,11 +589,12 @@ Answer the question using the sources above. In your response:
             "retrieved_chunks": [],
             "answer": "",
             "citations": [],
+            "classification": None,
             "error": None
         }
 
         # Run graph
-        result = self.graph.invoke(initial_state)
+        result = await self.graph.ainvoke(initial_state)
 
         return {
             "answer": result["answer"],
@@ -4,6 +4,7 @@ Manages document and clause embeddings for RAG pipeline.
 Per-workspace isolation for data separation.
 """
 from typing import List, Dict, Optional
+import asyncio
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from pathlib import Path
@@ -200,18 +201,9 @@ class VectorStore:
         Returns:
             List of search results with document text, metadata, and score
         """
-        # Build cache key
-        filter_str = str(sorted(filter_metadata.items())) if filter_metadata else ""
-        cache_key_parts = [
-            "vector_search",
-            workspace_id,
-            hashlib.sha256(query.encode()).hexdigest()[:16],
-            str(n_results),
-            str(include_clauses),
-            str(include_chunks),
-            hashlib.sha256(filter_str.encode()).hexdigest()[:8]
-        ]
-        cache_key = ":".join(cache_key_parts)
+        cache_key = self._search_cache_key(
+            workspace_id, query, n_results, filter_metadata, include_clauses, include_chunks
+        )
         
         # Try cache first
         cached = cache_service.get(cache_key)
@@ -225,7 +217,90 @@ class VectorStore:
         if not query_embedding:
             return []
         
-        # Build where clause for filtering
+        # Query collection
+        results = collection.query(
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            where=self._build_where(filter_metadata, include_clauses, include_chunks),
+            include=["documents", "metadatas", "distances"]
+        )
+        formatted_results = self._format_results(results)
+        
+        # Cache results
+        cache_service.set(cache_key, formatted_results, ttl=settings.cache_vector_search_ttl)
+        
+        return formatted_results
+    
+    async def asearch(
+        self,
+        workspace_id: str,
+        query: str,
+        n_results: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        include_clauses: bool = True,
+        include_chunks: bool = True
+    ) -> List[Dict]:
+        """
+        Async search: same results as search() without blocking the event loop.
+        
+        The query embedding goes through the async (coalescing) embedding path;
+        Redis and ChromaDB calls are synchronous clients and run in a worker thread.
+        """
+        cache_key = self._search_cache_key(
+            workspace_id, query, n_results, filter_metadata, include_clauses, include_chunks
+        )
+        
+        cached = await asyncio.to_thread(cache_service.get, cache_key)
+        if cached is not None:
+            return cached
+        
+        query_embedding = await self.embedding_service.aget_embedding(query)
+        if not query_embedding:
+            return []
+        
+        def _query() -> List[Dict]:
+            collection = self.get_or_create_collection(workspace_id)
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                where=self._build_where(filter_metadata, include_clauses, include_chunks),
+                include=["documents", "metadatas", "distances"]
+            )
+            formatted_results = self._format_results(results)
+            cache_service.set(cache_key, formatted_results, ttl=settings.cache_vector_search_ttl)
+            return formatted_results
+        
+        return await asyncio.to_thread(_query)
+    
+    def _search_cache_key(
+        self,
+        workspace_id: str,
+        query: str,
+        n_results: int,
+        filter_metadata: Optional[Dict],
+        include_clauses: bool,
+        include_chunks: bool
+    ) -> str:
+        """Build the vector search cache key"""
+        filter_str = str(sorted(filter_metadata.items())) if filter_metadata else ""
+        cache_key_parts = [
+            "vector_search",
+            workspace_id,
+            hashlib.sha256(query.encode()).hexdigest()[:16],
+            str(n_results),
+            str(include_clauses),
+            str(include_chunks),
+            hashlib.sha256(filter_str.encode()).hexdigest()[:8]
+        ]
+        return ":".join(cache_key_parts)
+    
+    def _build_where(
+        self,
+        filter_metadata: Optional[Dict],
+        include_clauses: bool,
+        include_chunks: bool
+    ) -> Optional[Dict]:
+        """Build ChromaDB where clause from metadata filters and result types"""
         where = {}
         if filter_metadata:
             where.update(filter_metadata)
@@ -237,15 +312,10 @@ class VectorStore:
             where["type"] = "clause"
         # If both are True, don't filter by type
         
-        # Query collection
-        results = collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            where=where if where else None,
-            include=["documents", "metadatas", "distances"]
-        )
-        
-        # Format results
+        return where if where else None
+    
+    def _format_results(self, results: Dict) -> List[Dict]:
+        """Format a ChromaDB query response into search result dicts"""
         formatted_results = []
         if results["documents"] and len(results["documents"]) > 0:
             for i, doc in enumerate(results["documents"][0]):
@@ -270,9 +340,6 @@ class VectorStore:
                     "document_name": metadata.get("document_name", "")
                 })
         
-        # Cache results
-        cache_service.set(cache_key, formatted_results, ttl=settings.cache_vector_search_ttl)
-        
         return formatted_results
     
     def delete_document(self, workspace_id: str, document_id: str) -> bool: